@@ -40,6 +40,260 @@ the third block with a total of 11000
 the fifth block with a total of 10000
 which means the sum is 45000
 """
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+
+try:
+    import numpy as np
+except ImportError:
+    # numpy is optional, without it we simply use the pure python path
+    np = None
+
+
+def block_sums(lines):
+    """
+    sums up the blocks of a stream of lines
+
+    a generator that goes over the lines one by one and adds up the numbers of the current block.
+    once a blank line (or the end of the stream) is reached, the block's sum is yielded.
+    this way only the running sum of 1 block is kept in memory at any time
+
+    :param lines: an iterable of lines, each contains 1 number or is blank (e.g. an open file)
+    :return: a generator of the sums of the blocks, in the order they appear
+    :rtype: generator
+    """
+    total = 0
+    # shows if the current block has any numbers so repeated blank lines won't make empty blocks
+    in_block = False
+    for line in lines:
+        line = line.strip()
+        if line:
+            total += int(line)
+            in_block = True
+        elif in_block:
+            yield total
+            total = 0
+            in_block = False
+    if in_block:
+        yield total
+
+
+def top_k(sums, k):
+    """
+    finds the k biggest sums in a given iterable of sums
+
+    we keep a min heap of size k at most, so its smallest sum is always at the top
+    and gets replaced whenever a bigger sum shows up
+
+    :param sums: an iterable of sums (e.g. the generator of block_sums)
+    :param k: the number of the biggest sums we need
+    :type k: int
+
+    :return: the k biggest sums, from the biggest to the smallest
+    :rtype: list
+    """
+    heap = []
+    for total in sums:
+        if len(heap) < k:
+            heapq.heappush(heap, total)
+        elif total > heap[0]:
+            heapq.heapreplace(heap, total)
+    return sorted(heap, reverse=True)
+
+
+def numpy_block_sums(file_name):
+    """
+    sums up the blocks of a given file using numpy
+
+    the whole file is read as 1 buffer of bytes and parsed without any python level loop:
+    each run of digits is a number. every digit is multiplied by 10 to the power of its distance
+    from the end of its run, and the digits of each run are added up with np.add.reduceat.
+    each number then gets the serial number of its block, which is the amount of blank lines
+    (a newline right after a newline) before it, and the numbers of each block are added up
+    with np.add.reduceat as well.
+    numbers and sums are int64, so when a number has more than 18 digits or the sums might get too big,
+    we give up
+
+    :param file_name: the name of the file to read
+    :type file_name: str
+
+    :return: the sums of the blocks, in the order they appear, or None if they might not fit in int64
+    :rtype: numpy.ndarray
+    """
+    data = np.fromfile(file_name, dtype=np.uint8)
+    # we ignore carriage returns so windows line endings are fine too
+    data = data[data != ord("\r")]
+    is_digit = (data >= ord("0")) & (data <= ord("9"))
+    if not is_digit.any():
+        return np.zeros(0, dtype=np.int64)
+    # a run starts with a digit that has no digit before it and ends with a digit that has no digit after it
+    edges = np.diff(np.concatenate(([False], is_digit, [False])).astype(np.int8))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1) - 1
+    digit_positions = np.flatnonzero(is_digit)
+    run_lengths = run_ends - run_starts + 1
+    if run_lengths.max() > 18:
+        return None
+    # for each digit, its distance from the end of its run, which is the power of 10 it's worth
+    powers = np.repeat(run_ends, run_lengths) - digit_positions
+    digits = (data[digit_positions] - ord("0")).astype(np.int64) * (10 ** powers.astype(np.int64))
+    # the offsets of the runs inside the digits array are the cumulative lengths of the runs before them
+    numbers = np.add.reduceat(digits, np.concatenate(([0], np.cumsum(run_lengths)[:-1])))
+    # no block's sum can be bigger than the biggest number times the amount of numbers
+    if float(numbers.max()) * len(numbers) >= 2 ** 63:
+        return None
+    newlines = np.flatnonzero(data == ord("\n"))
+    blank_lines = newlines[1:][np.diff(newlines) == 1]
+    block_ids = np.searchsorted(blank_lines, run_starts)
+    # numbers are ordered, so each block starts where the block id changes
+    block_starts = np.flatnonzero(np.concatenate(([True], block_ids[1:] != block_ids[:-1])))
+    return np.add.reduceat(numbers, block_starts)
+
+
+def top_blocks(file_name, k, vectorized=False):
+    """
+    finds the k biggest blocks' sums in a given file
+
+    by default, the file is read line by line in a single pass.
+    if vectorized is set and numpy is installed, the file is parsed with numpy_block_sums instead,
+    which is a lot faster but needs the whole file in memory.
+    if the numbers are too big for numpy, we fall back to reading line by line
+
+    :param file_name: the name of the file to read
+    :type file_name: str
+
+    :param k: the number of the biggest blocks we need
+    :type k: int
+
+    :param vectorized: shows if we should use numpy when it's available
+    :type vectorized: bool
+
+    :return: the k biggest blocks' sums, from the biggest to the smallest
+    :rtype: list
+    """
+    sums = numpy_block_sums(file_name) if vectorized and np is not None else None
+    if sums is not None:
+        if len(sums) > k:
+            # np.partition places the k biggest sums at the end without sorting the whole array
+            sums = np.partition(sums, len(sums) - k)[len(sums) - k:]
+        return sorted((int(total) for total in sums), reverse=True)
+    with open(file_name, "r") as f:
+        return top_k(block_sums(f), k)
+
+
+def chunk_ranges(file_name, chunks):
+    """
+    splits a file into byte ranges that don't cut any block in the middle
+
+    we pick evenly spaced offsets and move each one forward right after the next blank line
+    so every range starts at the beginning of a block.
+    ranges are contiguous and cover the whole file
+
+    :param file_name: the name of the file to split
+    :type file_name: str
+
+    :param chunks: the number of ranges we aim for (might be less for small files)
+    :type chunks: int
+
+    :return: a list of tuples, each tuple includes the range's start and end offsets
+    :rtype: list
+    """
+    size = os.path.getsize(file_name)
+    bounds = [0]
+    with open(file_name, "rb") as f:
+        for i in range(1, chunks):
+            # we start 1 byte before the offset in case it's right in the middle of a blank line
+            offset = max(size * i // chunks - 1, bounds[-1])
+            f.seek(offset)
+            tail = b""
+            while True:
+                buffer = f.read(1 << 16)
+                if not buffer:
+                    offset = size
+                    break
+                found = (tail + buffer).find(b"\n\n")
+                if found != -1:
+                    offset += found - len(tail) + 2
+                    break
+                offset += len(buffer)
+                # we keep the last byte in case the blank line is split between 2 buffers
+                tail = buffer[-1:]
+            if offset >= size:
+                break
+            if offset > bounds[-1]:
+                bounds.append(offset)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def read_range(f, length):
+    """
+    reads lines from a binary file up to a given amount of bytes
+
+    :param f: a binary file object which is already at the range's start
+    :param length: the number of bytes to read
+    :type length: int
+
+    :return: a generator of the lines in the range
+    :rtype: generator
+    """
+    while length > 0:
+        line = f.readline(length)
+        if not line:
+            return
+        length -= len(line)
+        yield line
+
+
+def chunk_top_blocks(job):
+    """
+    finds the k biggest blocks' sums in 1 byte range of a file
+
+    used by the workers of parallel_top_blocks, so it receives all of its arguments
+    in a single tuple
+
+    :param job: a tuple of the file's name, the range's start and end, and k
+    :type job: tuple
+
+    :return: the range's k biggest blocks' sums, from the biggest to the smallest
+    :rtype: list
+    """
+    file_name, start, end, k = job
+    with open(file_name, "rb") as f:
+        f.seek(start)
+        return top_k(block_sums(read_range(f, end - start)), k)
+
+
+def parallel_top_blocks(file_name, k, processes=None, chunk_size=1 << 24):
+    """
+    finds the k biggest blocks' sums in a given file using a pool of processes
+
+    the file is split by chunk_ranges, each worker finds the local top k of its range,
+    and we merge all local results into the global top k
+
+    :param file_name: the name of the file to read
+    :type file_name: str
+
+    :param k: the number of the biggest blocks we need
+    :type k: int
+
+    :param processes: the number of worker processes, defaults to the number of cores
+    :type processes: int
+
+    :param chunk_size: the approximate size of each range in bytes
+    :type chunk_size: int
+
+    :return: the k biggest blocks' sums, from the biggest to the smallest
+    :rtype: list
+    """
+    processes = processes or os.cpu_count() or 1
+    # we make at least 1 range per worker, and more for big files so ranges stay small
+    chunks = max(processes, -(-os.path.getsize(file_name) // chunk_size))
+    jobs = [(file_name, start, end, k) for start, end in chunk_ranges(file_name, chunks)]
+    with ProcessPoolExecutor(processes) as executor:
+        return top_k(chain.from_iterable(executor.map(chunk_top_blocks, jobs)), k)
 
 
 def part1():
@@ -52,11 +306,8 @@ def part1():
     :return: the sum of the biggest block
     :rtype: int
     """
-    with open("Day1Input.txt", "r") as f:
-        # we read and evaluates the file's content into a list
-        # each block of numbers is stored in a different sub list
-        blocks = [[eval(num) for num in block.split("\n")] for block in f.read().split("\n\n")]
-    print(max([sum(block) for block in blocks]))
+    # the biggest block is simply the top 1 block
+    print(sum(top_blocks("Day1Input.txt", 1)))
 
 
 def part2():
@@ -69,12 +320,26 @@ def part2():
     :return: the sum of the top 3 biggest blocks
     :rtype: int
     """
-    with open("Day1Input.txt", "r") as f:
-        # we read and evaluates the file's content into a list
-        # each block of numbers' sum is stored into the list which is then sorted
-        blocks = sorted([sum([eval(num) for num in block.split("\n")]) for block in f.read().split("\n\n")])
-    # pop gets the last value in the list. 3 last ones are the top 3
-    print(sum([blocks.pop() for i in range(3)]))
+    print(sum(top_blocks("Day1Input.txt", 3)))
+
+
+def both_parts(processes=None):
+    """
+    takes care of both parts in a single run using a pool of processes
+
+    reads Day1Input.txt in parallel and prints the answers of part 1 and part 2.
+    the top 3 biggest blocks are enough for both parts since the biggest block is the first of them
+
+    :param processes: the number of worker processes, defaults to the number of cores
+    :type processes: int
+
+    :return: the answers of part 1 and part 2
+    :rtype: tuple
+    """
+    blocks = parallel_top_blocks("Day1Input.txt", 3, processes)
+    print(blocks[0])
+    print(sum(blocks))
+    return blocks[0], sum(blocks)
 
 
 def main():
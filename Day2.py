@@ -44,152 +44,262 @@ ending with a score of 1 + 0 = 1.
 In the third round, right player defeated left player's Scissors with Rock for a score of 1 + 6 = 7.
 Meaning right player got a total score of 12.
 """
+from array import array
 
 
-def part1():
+def score_part1(a, b):
+    """
+    calculates the score of a match between a and b according to the rules of part 1
+
+    The score is calculated for the right player (b)
+    according to the scoring rules mentioned above.
+    The calculation is done as follows:
+    The ascii value of a is between 65 and 67 (inclusive) for rock, paper and scissors respectively.
+    and the ascii value of b is between 88 and 90 (inclusive) for rock, paper and scissors respectively.
+    Therefore, the difference between the ascii values of a and b ('b' - 'a') is:
+    23 in case of a draw ; 24 or 21 in case of a win ; 22 or 25 in case of a loss.
+    meaning that the difference between the ascii values of a and b modulo 3 is:
+    2 in case of a draw ; 0 in case of a win ; 1 in case of a loss.
+    Therefore, the score of the match is calculated based on the result of the modulo operation.
+    Additionally, the score is increased by the ascii value of b modulo 87,
+    which is 1 for rock, 2 for paper and 3 for scissors.
+
+    :param a: the left player's choice
+    :type a: str
+
+    :param b: the right player's choice
+    :type b: str
+
+    :return: the score of the match
+    :rtype: int
     """
-    takes care of part 1
 
-    reads Day2Input.txt and prints the sum of the scores of all matches
-    according to the rules of part 1
+    match_result = (ord(b) - ord(a)) % 3
+    match_score = 6 if match_result == 0 else 3 if match_result == 2 else 0
+    return ord(b) % 87 + match_score
 
-    :return: the sum of the scores of all matches
+
+def score_part2(a, b):
+    """
+    calculates the score of a match between a and b according to the rules of part 2
+
+    The score is calculated for the right player (b)
+    according to the scoring rules mentioned above.
+    a has the value of its ascii number modulo 64 (1 for rock, 2 for paper and 3 for scissors).
+    in case of a win, b chose the element that comes after a's element (rock comes after scissors),
+    in case of losing, b chose the element that comes before a's element (scissors comes before rock)
+    and in case of a draw, b chose the same element as a.
+    the match score is b's ascii value % 88 * 3 (0 for 'X'-lose, 3 for 'Y'-draw and 6 for 'Z'-win)
+
+    :param a: the left player's choice
+    :type a: str
+
+    :param b: the match's result
+    :type b: str
+
+    :return: the score of the match
     :rtype: int
     """
+    # the offset of b's element from a's element: +1 to win, -1 to lose and 0 for a draw
+    offset = ord(b) % 88 - 1
+    element_score = (ord(a) % 64 - 1 + offset) % 3 + 1
+    return (ord(b) % 88) * 3 + element_score
+
+
+class RuleSet:
+    """
+    presents a set of scoring rules - compiled once into a flat table of the score of every possible match
+    """
 
-    def score_part1(a, b):
+    def __init__(self, left, right, score):
         """
-        calculates the score of a match between a and b
-
-        The score is calculated for the right player (b)
-        according to the scoring rules mentioned above.
-        The calculation is done as follows:
-        The ascii value of a is between 65 and 67 (inclusive) for rock, paper and scissors respectively.
-        and the ascii value of b is between 88 and 90 (inclusive) for rock, paper and scissors respectively.
-        Therefore, the difference between the ascii values of a and b ('b' - 'a') is:
-        23 in case of a draw ; 24 or 21 in case of a win ; 22 or 25 in case of a loss.
-        meaning that the difference between the ascii values of a and b modulo 3 is:
-        2 in case of a draw ; 0 in case of a win ; 1 in case of a loss.
-        Therefore, the score of the match is calculated based on the result of the modulo operation.
-        Additionally, the score is increased by the ascii value of b modulo 87,
-        which is 1 for rock, 2 for paper and 3 for scissors.
-
-        :param a: the left player's choice
-        :type a: str
-
-        :param b: the right player's choice
-        :type b: str
-
-        :return: the score of the match
-        :rtype: int
+        init a rule set by compiling its table
+
+        every possible match is a line of the format 'a b' where a is one of the letters in left
+        and b is one of the letters in right. the score function is called once per possible match
+        and the results are stored in an array, ordered the same as 'matches'
+
+        :param left: the letters the left player can use
+        :type left: str
+
+        :param right: the letters the right player can use
+        :type right: str
+
+        :param score: a function that receives a and b and returns the match's score (e.g. score_part1)
+        :type score: function
         """
+        self.matches = [a + " " + b for a in left for b in right]
+        self.table = array("q", (score(match[0], match[-1]) for match in self.matches))
 
-        match_result = (ord(b) - ord(a)) % 3
-        match_score = 6 if match_result == 0 else 3 if match_result == 2 else 0
-        return ord(b) % 87 + match_score
+    @classmethod
+    def from_moves(cls, moves, beats, left, right, right_is_outcome=False, points=None, outcome_points=(0, 3, 6)):
+        """
+        builds a rule set out of the definition of the game
 
-    with open("Day2Input.txt", 'r') as f:
-        # we read the file's content into a list of sub lists
-        # each sub list contains the left player's choice and the right player's choice
-        matches = [[match[0], match[-1]] for match in f.read().splitlines()]
-    print(sum([score_part1(match[0], match[1]) for match in matches]))
+        a move's points default to its serial number (counting from 1) in moves.
+        by default, the letters in right are moves just like in part 1.
+        if right_is_outcome is set, right has 3 letters for losing, a draw and winning just like in part 2,
+        and the right player's move is the first move in moves that gets that outcome
 
+        :param moves: the names of the moves, e.g. ['rock', 'paper', 'scissors']
+        :type moves: list
 
-def part2():
-    """
-    takes care of part 2
+        :param beats: maps each move to the moves it beats
+        :type beats: dict
 
-    reads Day2Input.txt and prints the sum of the scores of all matches
-    according to the rules of part 2
+        :param left: the letters the left player uses for each move, in the same order as moves
+        :type left: str
 
-    :return: the sum of the scores of all matches
-    :rtype: int
-    """
+        :param right: the letters the right player uses for each move or each outcome
+        :type right: str
 
-    def score_part2(a, b):
-        """
-        calculates the score of a match between a and b
+        :param right_is_outcome: shows if the letters in right stand for the outcome instead of a move
+        :type right_is_outcome: bool
+
+        :param points: the points of each move, in the same order as moves
+        :type points: list
+
+        :param outcome_points: the points of losing, a draw and winning
+        :type outcome_points: tuple
 
-        The score is calculated for the right player (b)
-        according to the scoring rules mentioned above
-        and based on the instructions of part 2
+        :return: the compiled rule set
+        :rtype: RuleSet
+        """
+        points = points or range(1, len(moves) + 1)
+        move_points = dict(zip(moves, points))
+        left_moves = dict(zip(left, moves))
+
+        def outcome(a_move, b_move):
+            # 0 for losing, 1 for a draw and 2 for winning
+            return 2 if a_move in beats[b_move] else 1 if a_move == b_move else 0
+
+        def score(a, b):
+            a_move = left_moves[a]
+            if right_is_outcome:
+                wanted = right.index(b)
+                b_move = next(move for move in moves if outcome(a_move, move) == wanted)
+            else:
+                b_move = moves[right.index(b)]
+            return move_points[b_move] + outcome_points[outcome(a_move, b_move)]
+
+        return cls(left, right, score)
+
+    def total(self, counts):
+        """
+        calculates the total score of all matches
 
-        :param a: the left player's choice
-        :type a: str
+        since every match of the same kind has the same score, the total score
+        is the sum of each match's count multiplied by its score
 
-        :param b: the match's result
-        :type b: str
+        :param counts: maps each match to the number of times it appears, as returned by count_matches
+        :type counts: dict
 
-        :return: the score of the match
+        :return: the total score
         :rtype: int
         """
+        return sum(counts.get(match, 0) * score for match, score in zip(self.matches, self.table))
+
 
-        def element_score():
-            """
-            calculates the element point bonus
+PART1_RULES = RuleSet("ABC", "XYZ", score_part1)
+PART2_RULES = RuleSet("ABC", "XYZ", score_part2)
 
-            calculation is based on b and the instructions
-            of part 2
 
-            :return: element point bonus
-            :rtype: int
-            """
+def count_matches(file_name, matches, chunk_size=1 << 24):
+    """
+    counts how many times each given match appears in a given file
+
+    the file is read as raw bytes in chunks. each chunk is completed up to the end of its last line,
+    so no match is cut between 2 chunks, and the matches are counted in it with bytes.count
 
-            def win():
-                """
-                calculates the element point bonus in case of a win
+    :param file_name: the name of the file to read
+    :type file_name: str
 
-                a has the value of its ascii number modulo 64
-                So, the element b chose has that value + 1 unless a is scissors
-                which means b's element is rock thus worth 1 point
+    :param matches: the matches to count, each is a line of the format 'a b'
+    :type matches: iterable
+
+    :param chunk_size: the approximate size of each chunk in bytes
+    :type chunk_size: int
+
+    :return: maps each match to the number of times it appears
+    :rtype: dict
+    """
+    counts = dict.fromkeys(matches, 0)
+    patterns = [(match, match.encode()) for match in counts]
+    with open(file_name, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            chunk += f.readline()
+            for match, pattern in patterns:
+                counts[match] += chunk.count(pattern)
+    return counts
+
+
+def score_file(file_name, rule_sets):
+    """
+    scores all matches in a given file under any number of rule sets
+
+    the file is read only once, counting every match that appears in any of the rule sets,
+    and then each rule set's total score is calculated from those counts
+
+    :param file_name: the name of the file to read
+    :type file_name: str
+
+    :param rule_sets: the rule sets to score the matches by
+    :type rule_sets: list
+
+    :return: the total score under each rule set, in the same order as rule_sets
+    :rtype: list
+    """
+    counts = count_matches(file_name, (match for rule_set in rule_sets for match in rule_set.matches))
+    return [rule_set.total(counts) for rule_set in rule_sets]
+
+
+def part1():
+    """
+    takes care of part 1
 
-                :return: element point bonus
-                :rtype: int
-                """
-                temp = (ord(a) % 64) + 1
-                return temp if temp <= 3 else 1
+    reads Day2Input.txt and prints the sum of the scores of all matches
+    according to the rules of part 1
 
-            def lose():
-                """
-                calculates the element point bonus in case of losing
+    :return: the sum of the scores of all matches
+    :rtype: int
+    """
+    print(score_file("Day2Input.txt", [PART1_RULES])[0])
 
-                a has the value of its ascii number modulo 64
-                So, the element b chose has that value - 1 unless a is rock
-                which means b's element is scissors thus worth 3 point
 
-                :return: element point bonus
-                :rtype: int
-                """
-                temp = (ord(a) % 64) - 1
-                return temp if temp > 0 else 3
+def part2():
+    """
+    takes care of part 2
 
-            def draw():
-                """
-                calculates the element point bonus in case of a draw
+    reads Day2Input.txt and prints the sum of the scores of all matches
+    according to the rules of part 2
 
-                a has the value of its ascii number modulo 64
-                So, the element b chose has that same value
+    :return: the sum of the scores of all matches
+    :rtype: int
+    """
+    print(score_file("Day2Input.txt", [PART2_RULES])[0])
 
-                :return: element point bonus
-                :rtype: int
-                """
-                return ord(a) % 64
 
-            return win() if b == 'Z' else lose() if b == 'X' else draw()
+def both_parts():
+    """
+    takes care of both parts in a single pass
 
-        # match score is b's ascii value % 88 * 3 (0 for 'X'-lose, 3 for 'Y'-draw and 6 for 'Z'-win)
-        return (ord(b) % 88) * 3 + element_score()
+    reads Day2Input.txt once and prints the answers of part 1 and part 2
+    since both parts only need the number of times each match appears
 
-    with open("Day2Input.txt", 'r') as f:
-        # we read the file's content into a list of sub lists
-        # each sub list contains the left player's choice and the right player's choice
-        matches = [[match[0], match[-1]] for match in f.read().splitlines()]
-    print(sum([score_part2(match[0], match[1]) for match in matches]))
+    :return: the answers of part 1 and part 2
+    :rtype: tuple
+    """
+    answers = tuple(score_file("Day2Input.txt", [PART1_RULES, PART2_RULES]))
+    print(answers[0])
+    print(answers[1])
+    return answers
 
 
 def main():
-    part1()
-    part2()
+    both_parts()
 
 
 if __name__ == "__main__":
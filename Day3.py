@@ -58,6 +58,10 @@ In the first group, the only character that appears in all three rucksacks is 'r
 In the second group, the only character that appears in all three rucksacks is 'Z'.
 Meaning the values we found are 18 (r) and 52 (Z) which sums up to 70.
 """
+from array import array
+from functools import reduce
+from operator import or_
+
 # we create a dictionary with the values of each letter
 # lowercase letters have values 1 through 26 which we get by subtracting 96 from the ascii value of the letter
 letters_values = {chr(i): i - 96 for i in range(ord("a"), ord("z") + 1)}
@@ -65,6 +69,98 @@ letters_values = {chr(i): i - 96 for i in range(ord("a"), ord("z") + 1)}
 letters_values.update({chr(i): i - 38 for i in range(ord("A"), ord("Z") + 1)})
 
 
+# each letter is presented by a single bit in a bitmask, the bit's position is the letter's value
+# so a set of letters fits into 1 integer of 53 bits at most (bit 0 is never used).
+# folding a word into a bitmask is done in python, so it's slower than a set intersection for a single query,
+# but millions of words can be stored compactly as bitmasks (see rucksacks_masks)
+letters_bits = {letter: 1 << value for letter, value in letters_values.items()}
+
+
+def letters_mask(word):
+    """
+    folds a word's letters into a bitmask
+
+    :param word: a string of letters
+    :type word: str
+
+    :return: a bitmask where the bit of each letter in the word is on
+    :rtype: int
+    """
+    return reduce(or_, map(letters_bits.__getitem__, word), 0)
+
+
+def mask_value(mask):
+    """
+    finds the value of a letter out of its bitmask
+
+    the position of the highest bit that is on is the value of its letter,
+    so for a mask of a single letter, it's simply that letter's value
+
+    :param mask: a bitmask of letters
+    :type mask: int
+
+    :return: the value of the highest letter in the mask (0 for an empty mask)
+    :rtype: int
+    """
+    return max(mask.bit_length() - 1, 0)
+
+
+def rucksacks_masks(file_name):
+    """
+    reads a file of words into a compact array of bitmasks
+
+    :param file_name: the name of the file to read
+    :type file_name: str
+
+    :return: the bitmask of each word in the file, in the same order
+    :rtype: array
+    """
+    with open(file_name, "r") as f:
+        return array("Q", (letters_mask(word) for word in f.read().split()))
+
+
+def scan_rucksacks(file_name):
+    """
+    calculates the answers of both parts in a single pass over a given file
+
+    the file is read line by line. each word's halves are checked for part 1 right away
+    and the word's letters are intersected with the current group's letters for part 2.
+    once a group has 3 words, its letter is added to the sum and a new group begins.
+    blank lines are skipped and a final group with less than 3 words is ignored
+
+    :param file_name: the name of the file to read
+    :type file_name: str
+
+    :return: the sum of part 1 (both halves of each word) and the sum of part 2 (all 3 words of each group)
+    :rtype: tuple
+    """
+    halves_sum = 0
+    groups_sum = 0
+    # the letters that appear in all words of the current group so far
+    group_letters = set()
+    group_size = 0
+    with open(file_name, "r") as f:
+        for line in f:
+            word = line.strip()
+            if not word:
+                continue
+            half = len(word) // 2
+            # set intersection runs in C, which is faster than folding each letter into a bitmask in python.
+            # there's a single common letter in a valid word, so the loop adds just its value
+            for letter in set(word[:half]).intersection(word[half:]):
+                halves_sum += letters_values[letter]
+            if group_size == 0:
+                group_letters = set(word)
+            else:
+                group_letters.intersection_update(word)
+            group_size += 1
+            if group_size == 3:
+                for letter in group_letters:
+                    groups_sum += letters_values[letter]
+                group_size = 0
+    return halves_sum, groups_sum
+
+
 def part1():
     """
     takes care of part 1
@@ -74,14 +170,7 @@ def part1():
     :return: the sum of the letters that appear on both halves of each word
     :rtype: int
     """
-    with open("Day3Input.txt", "r") as f:
-        # we read the file's content into a list
-        # each word is split in half and stored in a sub list
-        words = [[word[0:len(word) // 2], word[len(word) // 2:]] for word in f.read().split("\n")]
-    # we create a list of sets of letters that appear on both halves of each word
-    letters = [set(word[0]) & set(word[1]) for word in words]
-    # we pop each set of letters and add the value of each letter to the final sum
-    print(sum(letters_values[letter.pop()] for letter in letters))
+    print(scan_rucksacks("Day3Input.txt")[0])
 
 
 def part2():
@@ -93,20 +182,26 @@ def part2():
     :return: the sum of the letters that appear on all 3 lines for each group
     :rtype: int
     """
-    with open("Day3Input.txt", "r") as f:
-        # we read the file's content into a list
-        words = f.read().split("\n")
-    # we make a new list which contains sub lists of each trio of words from 'words'
-    words_groups = [[words[i], words[i + 1], words[i + 2]] for i in range(0, len(words), 3)]
-    # we create a list of sets of letters that appear in all 3 words for each group
-    letters = [set(words[0]) & set(words[1]) & set(words[2]) for words in words_groups]
-    # we pop each set of letters and add the value of each letter to the final sum
-    print(sum(letters_values[letter.pop()] for letter in letters))
+    print(scan_rucksacks("Day3Input.txt")[1])
+
+
+def both_parts():
+    """
+    takes care of both parts in a single pass
+
+    reads Day3Input.txt once and prints the answers of part 1 and part 2
+
+    :return: the answers of part 1 and part 2
+    :rtype: tuple
+    """
+    answers = scan_rucksacks("Day3Input.txt")
+    print(answers[0])
+    print(answers[1])
+    return answers
 
 
 def main():
-    part1()
-    part2()
+    both_parts()
 
 
 if __name__ == "__main__":
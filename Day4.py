@@ -31,40 +31,305 @@ while the remaining four pairs (5-7,7-9, 2-8,3-7, 6-6,4-6, and 2-6,4-8) do overl
 2-6,4-8 overlaps in numbers 4, 5, and 6.
 So, in this example, the number of lines with overlapping range pairs is 4.
 """
+try:
+    import numpy as np
+except ImportError:
+    # numpy is optional, without it we simply use the pure python path
+    np = None
 
 
-def part1():
+class Interval:
+    """
+    presents a range of numbers by its edges only, so checks don't depend on the range's width
     """
-    takes care of part 1
 
-    reads Day4Input.txt and counts how many lines have 1 range that contains the other
+    def __init__(self, start, end):
+        """
+        init a range of numbers
 
-    :return: the number of lines where 1 range is completely contained by the other
-    :rtype: int
-    """
+        :param start: the first number in the range
+        :type start: int
+
+        :param end: the last number in the range (inclusive)
+        :type end: int
+        """
+        self.start = start
+        self.end = end
+
+    def contains(self, other):
+        """
+        checks if another range is completely contained in this range
+
+        :param other: the range to check
+        :type other: Interval
 
-    def contained(a_start, a_end, b_start, b_end):
+        :return: True if other is contained in this range, otherwise False
+        :rtype: bool
+        """
+        return self.start <= other.start and other.end <= self.end
+
+    def overlaps(self, other):
         """
-        checks range containment
+        checks if another range has at least 1 number in common with this range
+
+        2 ranges overlap unless 1 of them ends before the other starts
 
-        receives 2 ranges of numbers - a and b
-        checks if a given range is contained in the other
+        :param other: the range to check
+        :type other: Interval
 
-        :param a_start: start of range a
-        :param a_end: end of range a
-        :param b_start: start of range b
-        :param b_end: end of range b
-        :return: True if 1 range is contains in the other, otherwise False
+        :return: True if there's an overlap between the ranges, otherwise False
         :rtype: bool
         """
-        # we first check which range is bigger, and then, we check if it contains the smaller range
-        if len(range(a_start, a_end + 1)) > len(range(b_start, b_end + 1)):
-            return a_end >= b_end and a_start <= b_start
-        return a_end <= b_end and a_start >= b_start
+        return self.start <= other.end and other.start <= self.end
+
+    def __repr__(self):
+        return repr(self.start) + "-" + repr(self.end)
+
+
+def parse_pair(line):
+    """
+    parses a line of the format 'a-b,c-d' into 2 ranges
+
+    :param line: a line from the input file
+    :type line: str
+
+    :return: the 2 ranges of the line
+    :rtype: tuple
+    """
+    a_start, a_end, b_start, b_end = map(int, line.replace(',', '-').split('-'))
+    return Interval(a_start, a_end), Interval(b_start, b_end)
+
+
+class IntervalTreeNode:
+    """
+    presents a node of a centered interval tree
+
+    the node holds all ranges that contain its center. ranges that end before the center
+    are stored in the left subtree, and ranges that start after the center are stored in the right subtree
+    """
+
+    def __init__(self, ranges):
+        """
+        init a subtree out of a non empty list of ranges
+
+        the center is the median of all the ranges' edges, so each subtree gets at most half of the ranges
+        and the tree's depth is logarithmic.
+        the node's ranges are kept twice, sorted by their start and by their end (descending),
+        so a query only goes over the ranges it reports plus 1
+
+        :param ranges: a list of tuples, each tuple includes a range's start, end and pair's line number
+        :type ranges: list
+        """
+        edges = sorted(edge for start, end, line in ranges for edge in (start, end))
+        self.center = edges[len(edges) // 2]
+        left = [r for r in ranges if r[1] < self.center]
+        right = [r for r in ranges if r[0] > self.center]
+        middle = [r for r in ranges if r[0] <= self.center <= r[1]]
+        self.by_start = sorted(middle)
+        self.by_end = sorted(middle, key=lambda r: r[1], reverse=True)
+        self.left = IntervalTreeNode(left) if left else None
+        self.right = IntervalTreeNode(right) if right else None
+
+
+class IntervalIndex:
+    """
+    presents an index over all ranges of a file that answers which pairs touch given sections
+    """
+
+    def __init__(self, pairs):
+        """
+        init the index out of the pairs of ranges
+
+        :param pairs: a list of tuples, each tuple includes the 2 ranges of a line (as returned by parse_pair)
+        :type pairs: list
+        """
+        self.pairs = pairs
+        # lines are counted from 1, just like in the file
+        ranges = [(r.start, r.end, line) for line, pair in enumerate(pairs, 1) for r in pair]
+        self.root = IntervalTreeNode(ranges) if ranges else None
+
+    @classmethod
+    def from_file(cls, file_name):
+        """
+        builds an index out of all the lines of a given file
+
+        :param file_name: the name of the file to read
+        :type file_name: str
+
+        :return: the index of the file's ranges
+        :rtype: IntervalIndex
+        """
+        with open(file_name, 'r') as f:
+            return cls([parse_pair(line) for line in f if line.strip()])
+
+    def overlapping(self, start, end):
+        """
+        finds all pairs that have a range which overlaps with a given range of sections
+
+        we go down the tree from the root. at each node, if the given range is entirely on 1 side
+        of the center, only the node's ranges that reach it are reported (in sorted order, so we stop
+        at the first that doesn't) and we continue to that side only.
+        otherwise, all the node's ranges are reported and we continue to both sides.
+
+        :param start: the first section of the range
+        :type start: int
+
+        :param end: the last section of the range (inclusive)
+        :type end: int
+
+        :return: the line numbers of the pairs
+        :rtype: set
+        """
+        lines = set()
+        nodes = [self.root]
+        while nodes:
+            node = nodes.pop()
+            if node is None:
+                continue
+            if end < node.center:
+                for r in node.by_start:
+                    if r[0] > end:
+                        break
+                    lines.add(r[2])
+                nodes.append(node.left)
+            elif start > node.center:
+                for r in node.by_end:
+                    if r[1] < start:
+                        break
+                    lines.add(r[2])
+                nodes.append(node.right)
+            else:
+                lines.update(r[2] for r in node.by_start)
+                nodes += [node.left, node.right]
+        return lines
+
+    def stabbing(self, section):
+        """
+        finds all pairs that have a range which contains a given section
+
+        :param section: the section to look for
+        :type section: int
+
+        :return: the line numbers of the pairs
+        :rtype: set
+        """
+        return self.overlapping(section, section)
+
+    def counts(self):
+        """
+        counts the answers of both parts out of the indexed pairs
+
+        :return: the number of lines where 1 range contains the other and the number of lines where the ranges overlap
+        :rtype: tuple
+        """
+        overlapping = [pair for pair in self.pairs if pair[0].overlaps(pair[1])]
+        contained = sum(1 for a, b in overlapping if a.contains(b) or b.contains(a))
+        return contained, len(overlapping)
 
-    with open("Day4Input.txt", 'r') as f:
-        ranges = [[eval(n) for n in line.replace(',', '-').split('-')] for line in f.read().splitlines()]
-    print(sum(1 for line in ranges if contained(line[0], line[1], line[2], line[3])))
+
+def numpy_ranges(file_name):
+    """
+    parses a whole file into a table of ranges using numpy
+
+    the file is read as 1 buffer of bytes. each run of digits is a number:
+    every digit is multiplied by 10 to the power of its distance from the end of its run,
+    and the digits of each run are added up with np.add.reduceat.
+    every 4 numbers in a row are the edges of 1 line's ranges.
+    numbers are int64, so a number with more than 18 digits might not fit, and then we give up
+
+    :param file_name: the name of the file to read
+    :type file_name: str
+
+    :return: a table with a row for each line, its columns are a_start, a_end, b_start and b_end,
+    or None if a number is too long for int64
+    :rtype: numpy.ndarray
+    """
+    data = np.fromfile(file_name, dtype=np.uint8)
+    is_digit = (data >= ord("0")) & (data <= ord("9"))
+    # a run starts with a digit that has no digit before it and ends with a digit that has no digit after it
+    edges = np.diff(np.concatenate(([False], is_digit, [False])).astype(np.int8))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1) - 1
+    if len(run_starts) == 0:
+        return np.zeros((0, 4), dtype=np.int64)
+    run_lengths = run_ends - run_starts + 1
+    if run_lengths.max() > 18:
+        return None
+    digit_positions = np.flatnonzero(is_digit)
+    # for each digit, its distance from the end of its run, which is the power of 10 it's worth
+    powers = (np.repeat(run_ends, run_lengths) - digit_positions).astype(np.int64)
+    digits = (data[digit_positions] - ord("0")).astype(np.int64) * (10 ** powers)
+    numbers = np.add.reduceat(digits, np.concatenate(([0], np.cumsum(run_lengths)[:-1])))
+    return numbers.reshape(-1, 4)
+
+
+def numpy_count_pairs(ranges):
+    """
+    counts the answers of both parts on a whole table of ranges at once
+
+    each check is done on entire columns, giving a boolean mask of the lines that pass it,
+    and the answers are the number of lines in each mask
+
+    :param ranges: a table of ranges, as returned by numpy_ranges
+    :type ranges: numpy.ndarray
+
+    :return: the number of lines where 1 range contains the other and the number of lines where the ranges overlap
+    :rtype: tuple
+    """
+    a_start, a_end, b_start, b_end = ranges.T
+    a_contains_b = (a_start <= b_start) & (b_end <= a_end)
+    b_contains_a = (b_start <= a_start) & (a_end <= b_end)
+    overlapping = (a_start <= b_end) & (b_start <= a_end)
+    return int(np.count_nonzero(a_contains_b | b_contains_a)), int(np.count_nonzero(overlapping))
+
+
+def count_pairs(file_name, vectorized=False):
+    """
+    counts the answers of both parts in a single pass over a given file
+
+    by default, the file is read line by line.
+    if vectorized is set and numpy is installed, the whole file is parsed into a table with numpy_ranges
+    and counted by numpy_count_pairs instead, which is a lot faster but needs the whole file in memory.
+    if a number is too long for numpy, we fall back to reading line by line
+
+    :param file_name: the name of the file to read
+    :type file_name: str
+
+    :param vectorized: shows if we should use numpy when it's available
+    :type vectorized: bool
+
+    :return: the number of lines where 1 range contains the other and the number of lines where the ranges overlap
+    :rtype: tuple
+    """
+    if vectorized and np is not None:
+        ranges = numpy_ranges(file_name)
+        if ranges is not None:
+            return numpy_count_pairs(ranges)
+    contained = 0
+    overlapping = 0
+    with open(file_name, 'r') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            a, b = parse_pair(line)
+            if a.overlaps(b):
+                overlapping += 1
+                # a range can only contain the other if they overlap
+                if a.contains(b) or b.contains(a):
+                    contained += 1
+    return contained, overlapping
+
+
+def part1():
+    """
+    takes care of part 1
+
+    reads Day4Input.txt and counts how many lines have 1 range that contains the other
+
+    :return: the number of lines where 1 range is completely contained by the other
+    :rtype: int
+    """
+    print(count_pairs("Day4Input.txt")[0])
 
 
 def part2():
@@ -76,31 +341,26 @@ def part2():
     :return: the number of lines where the ranges overlap
     :rtype: int
     """
+    print(count_pairs("Day4Input.txt")[1])
 
-    def overlaps(a_start, a_end, b_start, b_end):
-        """
-        checks range containment
 
-        receives 2 ranges of numbers - a and b
-        checks if the ranges overlap with each other
+def both_parts():
+    """
+    takes care of both parts in a single pass
 
-        :param a_start: start of range a
-        :param a_end: end of range a
-        :param b_start: start of range b
-        :param b_end: end of range b
-        :return: True if there's an overlap between the ranges, otherwise False
-        :rtype: bool
-        """
-        return len(set(range(a_start, a_end + 1)) & set(range(b_start, b_end + 1))) != 0
+    reads Day4Input.txt once and prints the answers of part 1 and part 2
 
-    with open("Day4Input.txt", 'r') as f:
-        ranges = [[eval(n) for n in line.replace(',', '-').split('-')] for line in f.read().splitlines()]
-    print(sum(1 for line in ranges if overlaps(line[0], line[1], line[2], line[3])))
+    :return: the answers of part 1 and part 2
+    :rtype: tuple
+    """
+    answers = count_pairs("Day4Input.txt")
+    print(answers[0])
+    print(answers[1])
+    return answers
 
 
 def main():
-    part1()
-    part2()
+    both_parts()
 
 
 if __name__ == "__main__":
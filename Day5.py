@@ -52,137 +52,545 @@ The final result will be:
 [Z] [M] [P]
  1   2   3
 """
+import random
 import re
-from functools import reduce
+import time
 
 
-def part1():
+def instructions_exe(piles, instructions, block=False):
     """
-    takes care of part 1
+    executes the instructions on the piles
 
-    reads Day5Input.txt and makes 2 lists. 1st is a list of all piles
-    2nd is a list of all instructions
+    the piles are changed in place, 1 instruction after the other.
+    the crates to move are cut off the top of the pile with a single slice and added to the other pile
+    with a single extend, so each instruction only costs as many crates as it moves.
+    when moving crates 1 by 1 (part 1), the moved crates end up in reversed order
 
-    :return: the string made of all the top crates' letters after piles are complete
-    :rtype: str
+    :param piles: the piles, each pile is a list of crates from the bottom to the top
+    :type piles: list
+
+    :param instructions: the instructions, each instruction is a trio of x, y and z (see the top of the file)
+    :type instructions: iterable
+
+    :param block: shows if several crates are moved as a block (part 2) instead of 1 by 1 (part 1)
+    :type block: bool
+
+    :return: the piles once the instructions are done
+    :rtype: list
     """
+    for count, source, target in instructions:
+        # crates that are put back on the pile they came from stay as they were
+        if source == target:
+            continue
+        from_pile = piles[source]
+        # we don't use a negative index since [-0:] would take the whole pile
+        start = len(from_pile) - count
+        to_move = from_pile[start:]
+        del from_pile[start:]
+        if not block:
+            to_move.reverse()
+        piles[target].extend(to_move)
+    return piles
+
+
+class SegmentPile:
+    """
+    presents a pile as a list of segments, so big blocks of crates are moved without copying them
 
-    def instructions_exe(_piles, _instructions):
+    each segment is a tuple of (data, start, end, flipped): the crates data[start:end] of a tuple that is
+    never changed, from the bottom to the top, or from the top to the bottom if flipped is set.
+    segments are ordered from the bottom of the pile to its top.
+    moving crates only cuts and moves segments, so it costs the number of segments moved and not
+    the number of crates, and moving crates 1 by 1 only flips the order of the segments and their flags
+    """
+
+    def __init__(self, crates=()):
+        """
+        init a pile out of its crates
+
+        :param crates: the crates from the bottom to the top
+        :type crates: iterable
         """
-        executes the instructions on the piles
+        crates = tuple(crates)
+        self.segments = [(crates, 0, len(crates), False)] if crates else []
+        self.size = len(crates)
 
-        recursive function.
-        each time, 1 instruction is executed and the func is recalled with the new arranged piles
-        and the instructions list minus the 1 who's got executed
-        This is to maintain the principals of pure functional programming
+    def take(self, count):
+        """
+        removes crates from the top of the pile
 
-        :param _piles: the piles at their current state of the iteration
-        :param _instructions: the instructions list based on the current state of the iteration
-        :return: the piles once the instructions are done, otherwise we recall the func
+        segments are removed from the top until we have enough crates.
+        the last segment needed is cut in 2 if only some of its crates are needed
+
+        :param count: how many crates to remove
+        :type count: int
+
+        :return: the removed segments, from the bottom to the top
         :rtype: list
         """
-        if len(_instructions) == 0:
-            return _piles
-        # we extract the first instruction in line
-        instruction = _instructions[0]
-        # we extract the crates that are needed to be moving and already arrange them properly
-        to_move = list(reversed(_piles[instruction[1]][-instruction[0]::]))
-        # we then add them to the right pile
-        to_pile = _piles[instruction[2]] + to_move
-        # we update the pile of which we took the crates
-        from_pile = _piles[instruction[1]][:-instruction[0]:]
-        # we reassemble the piles so that the 2 piles that were included in the instruction's execution
-        # are updated
-        temp_new_piles = [from_pile if i == instruction[1] else to_pile if i == instruction[2] else _piles[i] for i in
-                          range(len(_piles))]
-        # func is recalled with 1 instruction less and the newly arranged piles
-        return instructions_exe(temp_new_piles, _instructions[1::])
-
-    def remove_last_element(input_list):
-        return input_list[:-1:]
+        taken = []
+        self.size -= count
+        while count > 0:
+            data, start, end, flipped = self.segments.pop()
+            if end - start > count:
+                # the top crates of a flipped segment are at its start
+                if flipped:
+                    self.segments.append((data, start + count, end, True))
+                    taken.append((data, start, start + count, True))
+                else:
+                    self.segments.append((data, start, end - count, False))
+                    taken.append((data, end - count, end, False))
+                count = 0
+            else:
+                taken.append((data, start, end, flipped))
+                count -= end - start
+        taken.reverse()
+        return taken
+
+    def put(self, segments):
+        """
+        adds segments to the top of the pile
 
-    with open("Day5Input.txt", 'r') as f:
-        # data will split the file into the diagram part and the instructions part
-        data = f.read().split(' 1   2   3   4   5   6   7   8   9 \n\n')
-        # piles take first part of data, making an ordered list of the piles
-        # based on the input format, the letters appear on each cell from 1 with jumps of 4 (1,5,9..)
-        # for each cell i, we store all lines[i]'s chars to construct a pile.
-        # we then filter out empty chars (' ') and reverse each sublist to receive the correct pile
-        # I added 1 fake pile so we would address the piles with their actual serial number
-        piles = ['X'] + [list(filter(lambda x: x != ' ', reversed([line[i] for line in data[0].splitlines()]))) for i in
-                         range(1, 35, 4)]
-        # instructions are made into a list where each instruction is a trio of the numbers
-        # from the original instruction. first element in each sublist is x, then y and z (see line 9)
-        # the regular expression gives back all sequences of digits in the original string
-        instructions = [[eval(n) for n in re.findall(r'\d+', line)] for line in data[1].splitlines()]
-        new_piles = instructions_exe(piles, instructions)
-        # we now gather all top crates' letters
-        print(reduce(lambda x, y: x + y, [letter[-1] for letter in new_piles[1::]]))
-
-
-def part2():
+        :param segments: the segments to add, from the bottom to the top
+        :type segments: list
+        """
+        self.segments += segments
+        self.size += sum(end - start for data, start, end, flipped in segments)
+
+    def move_to(self, other, count, block=False):
+        """
+        moves crates from the top of this pile to the top of another pile
+
+        :param other: the pile to move the crates to
+        :type other: SegmentPile
+
+        :param count: how many crates to move
+        :type count: int
+
+        :param block: shows if the crates are moved as a block (part 2) instead of 1 by 1 (part 1)
+        :type block: bool
+        """
+        segments = self.take(count)
+        if not block:
+            segments = [(data, start, end, not flipped) for data, start, end, flipped in reversed(segments)]
+        other.put(segments)
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        """
+        finds a crate by its position in the pile
+
+        :param index: the crate's position from the bottom (negative positions count from the top)
+        :type index: int
+
+        :return: the crate's letter
+        :rtype: str
+        """
+        if not -self.size <= index < self.size:
+            raise IndexError("pile index out of range")
+        if index >= 0:
+            for data, start, end, flipped in self.segments:
+                if index < end - start:
+                    return data[end - 1 - index] if flipped else data[start + index]
+                index -= end - start
+        # negative positions are looked up from the top segment down, so the top crate only costs 1 segment
+        index = -index - 1
+        for data, start, end, flipped in reversed(self.segments):
+            if index < end - start:
+                return data[start + index] if flipped else data[end - 1 - index]
+            index -= end - start
+
+    def __iter__(self):
+        for data, start, end, flipped in self.segments:
+            yield from (reversed(data[start:end]) if flipped else data[start:end])
+
+
+def segment_instructions_exe(piles, instructions, block=False):
     """
-    takes care of part 2
+    executes the instructions on piles of segments
 
-    reads Day5Input.txt and makes 2 lists. 1st is a list of all piles
-    2nd is a list of all instructions
+    just like instructions_exe, but the piles are SegmentPile objects
 
-    :return: the string made of all the top crates' letters after piles are complete
-    :rtype: str
+    :param piles: the piles, each pile is a SegmentPile
+    :type piles: list
+
+    :param instructions: the instructions, each instruction is a trio of x, y and z (see the top of the file)
+    :type instructions: iterable
+
+    :param block: shows if several crates are moved as a block (part 2) instead of 1 by 1 (part 1)
+    :type block: bool
+
+    :return: the piles once the instructions are done
+    :rtype: list
     """
+    for count, source, target in instructions:
+        # crates that are put back on the pile they came from stay as they were
+        if source != target:
+            piles[source].move_to(piles[target], count, block)
+    return piles
 
-    def instructions_exe(_piles, _instructions):
+
+class PileHistory:
+    """
+    presents the piles at every step of the instructions, with checkpoints to rewind to
+
+    each pile is a persistent stack: a chain of (crate, rest) tuples from the top to the bottom, or None if empty.
+    moving crates creates new tuples for the moved crates only, and the rest of each pile is shared
+    with all previous versions, so old versions stay valid and cost nothing to keep.
+    every 'interval' instructions we record a checkpoint, which is just the top tuple of every pile
+    """
+
+    def __init__(self, piles, instructions, block=False, interval=1000):
         """
-        executes the instructions on the piles
+        init the history by executing all the instructions once
+
+        :param piles: the piles, each pile is a list of crates from the bottom to the top
+        :type piles: list
 
-        recursive function.
-        each time, 1 instruction is executed and the func is recalled with the new arranged piles
-        and the instructions list minus the 1 who's got executed
-        This is to maintain the principals of pure functional programming
+        :param instructions: the instructions, each instruction is a trio of x, y and z (see the top of the file)
+        :type instructions: iterable
 
-        :param _piles: the piles at their current state of the iteration
-        :param _instructions: the instructions list based on the current state of the iteration
-        :return: the piles once the instructions are done, otherwise we recall the func
+        :param block: shows if several crates are moved as a block (part 2) instead of 1 by 1 (part 1)
+        :type block: bool
+
+        :param interval: the number of instructions between 2 checkpoints
+        :type interval: int
+        """
+        self.instructions = list(instructions)
+        self.block = block
+        self.interval = interval
+        heads = []
+        for pile in piles:
+            head = None
+            for crate in pile:
+                head = (crate, head)
+            heads.append(head)
+        self.checkpoints = [tuple(heads)]
+        for step, instruction in enumerate(self.instructions, 1):
+            self.move(heads, instruction)
+            if step % interval == 0:
+                self.checkpoints.append(tuple(heads))
+
+    def move(self, heads, instruction):
+        """
+        executes 1 instruction on the piles' top tuples
+
+        :param heads: the top tuple of every pile, which is changed in place
+        :type heads: list
+
+        :param instruction: a trio of x, y and z (see the top of the file)
+        :type instruction: tuple
+        """
+        count, source, target = instruction
+        if source == target:
+            return
+        head = heads[source]
+        # the moved crates from the top to the bottom
+        to_move = []
+        for i in range(count):
+            crate, head = head
+            to_move.append(crate)
+        heads[source] = head
+        head = heads[target]
+        # moving 1 by 1 puts the top crate down first, a block puts its bottom crate down first
+        for crate in (reversed(to_move) if self.block else to_move):
+            head = (crate, head)
+        heads[target] = head
+
+    def heads_at(self, step):
+        """
+        finds the piles' top tuples after a given number of instructions
+
+        we start from the nearest checkpoint before the step and replay only the instructions after it
+
+        :param step: the number of instructions executed (0 is before any instruction)
+        :type step: int
+
+        :return: the top tuple of every pile
         :rtype: list
         """
-        if len(_instructions) == 0:
-            return _piles
-        # we extract the first instruction in line
-        instruction = _instructions[0]
-        # we extract the crates that are needed to be moving and already arrange them properly
-        # NOTE: this is the only change from part 1 as we DON'T use reversed()
-        to_move = list(_piles[instruction[1]][-instruction[0]::])
-        # we then add them to the right pile
-        to_pile = _piles[instruction[2]] + to_move
-        # we update the pile of which we took the crates
-        from_pile = _piles[instruction[1]][:-instruction[0]:]
-        # we reassemble the piles so that the 2 piles that were included in the instruction's execution
-        # are updated
-        temp_new_piles = [from_pile if i == instruction[1] else to_pile if i == instruction[2] else _piles[i] for i in
-                          range(len(_piles))]
-        # func is recalled with 1 instruction less and the newly arranged piles
-        return instructions_exe(temp_new_piles, _instructions[1::])
-
-    def remove_last_element(input_list):
-        return input_list[:-1:]
+        if not 0 <= step <= len(self.instructions):
+            raise IndexError("step out of range")
+        checkpoint = step // self.interval
+        heads = list(self.checkpoints[checkpoint])
+        for instruction in self.instructions[checkpoint * self.interval:step]:
+            self.move(heads, instruction)
+        return heads
+
+    def piles_at(self, step):
+        """
+        rebuilds the piles after a given number of instructions
+
+        :param step: the number of instructions executed (0 is before any instruction)
+        :type step: int
+
+        :return: the piles, each pile is a list of crates from the bottom to the top
+        :rtype: list
+        """
+        piles = []
+        for head in self.heads_at(step):
+            pile = []
+            while head is not None:
+                crate, head = head
+                pile.append(crate)
+            pile.reverse()
+            piles.append(pile)
+        return piles
+
+    def tops_at(self, step):
+        """
+        gathers all top crates' letters after a given number of instructions
+
+        :param step: the number of instructions executed (0 is before any instruction)
+        :type step: int
+
+        :return: the string made of all the top crates' letters, just like top_crates
+        :rtype: str
+        """
+        return ''.join(head[0] for head in self.heads_at(step)[1:] if head is not None)
+
+
+def read_piles(f):
+    """
+    reads the diagram part of an open file into a list of piles
+
+    the diagram ends at the first blank line, and its last line is the row of the piles' labels.
+    the labels give us the number of piles and where each pile's column is: crates are 4 chars wide ('[x] ')
+    so a crate's letter is at 1 + 4 * i, and each label is matched with the column closest to its middle.
+    we then go over the rows once from the bottom up and add each letter to its pile.
+    the list is indexed by the piles' labels, so the 1st pile (index 0) is a fake one
+
+    :param f: an open file at the beginning of the diagram
+    :type f: file
+
+    :return: the piles, each pile is a list of crates from the bottom to the top
+    :rtype: list
+    """
+    rows = []
+    for line in f:
+        if not line.strip():
+            break
+        rows.append(line.rstrip('\n'))
+    labels = rows.pop()
+    columns = {}
+    for label in re.finditer(r'\d+', labels):
+        middle = (label.start() + label.end() - 1) / 2
+        columns[int(label.group())] = 4 * round((middle - 1) / 4) + 1
+    piles = [[] for i in range(max(columns, default=0) + 1)]
+    for row in reversed(rows):
+        for pile, column in columns.items():
+            if column < len(row) and row[column] != ' ':
+                piles[pile].append(row[column])
+    return piles
+
+
+# the format of an instruction's line, compiled once for all lines
+INSTRUCTION = re.compile(r'move (\d+) from (\d+) to (\d+)')
+
+
+def read_instructions(f):
+    """
+    reads the instructions part of an open file
+
+    a generator, so instructions are parsed 1 by 1 while they're executed.
+    lines that aren't instructions are skipped
+
+    :param f: an open file right after the diagram
+    :type f: file
+
+    :return: a generator of the instructions, each instruction is a trio of x, y and z (see the top of the file)
+    :rtype: generator
+    """
+    for line in f:
+        instruction = INSTRUCTION.match(line)
+        if instruction:
+            yield int(instruction.group(1)), int(instruction.group(2)), int(instruction.group(3))
+
+
+def compact_instructions(instructions, block=False):
+    """
+    simplifies the instructions before they're executed
+
+    the compacted instructions are kept in a stack and each new instruction is compared with the top of it,
+    so an instruction can also combine with one that was uncovered by a previous cancellation.
+    - moving 0 crates, or moving crates from a pile to itself, changes nothing and is dropped.
+    - moving crates back to where they came from right after they were moved cancels out,
+      when the same number of crates is moved back.
+    - when moving crates 1 by 1 (part 1), an instruction is just a series of single crate moves,
+      so 2 moves between the same 2 piles are merged into 1 move: their counts are added up if they're
+      in the same direction and subtracted if they're in opposite directions.
+      that's not true for block moves (part 2), which keep the order of each block separately.
+
+    :param instructions: the instructions, each instruction is a trio of x, y and z (see the top of the file)
+    :type instructions: iterable
+
+    :param block: shows if several crates are moved as a block (part 2) instead of 1 by 1 (part 1)
+    :type block: bool
+
+    :return: the compacted instructions and the stats of the compaction
+    :rtype: tuple
+    """
+    compacted = []
+    stats = {"original": 0, "dropped": 0, "merged": 0, "cancelled": 0}
+    for count, source, target in instructions:
+        stats["original"] += 1
+        if count == 0 or source == target:
+            stats["dropped"] += 1
+            continue
+        if compacted:
+            last_count, last_source, last_target = compacted[-1]
+            if (last_source, last_target) == (target, source) and last_count == count:
+                # the 2 instructions cancel each other so both are gone
+                compacted.pop()
+                stats["cancelled"] += 2
+                continue
+            if not block and (last_source, last_target) == (source, target):
+                compacted[-1] = (last_count + count, source, target)
+                stats["merged"] += 1
+                continue
+            if not block and (last_source, last_target) == (target, source):
+                # the net move is in the direction of the bigger one
+                if last_count > count:
+                    compacted[-1] = (last_count - count, last_source, last_target)
+                else:
+                    compacted[-1] = (count - last_count, source, target)
+                stats["merged"] += 1
+                continue
+        compacted.append((count, source, target))
+    stats["compacted"] = len(compacted)
+    stats["removed"] = stats["original"] - stats["compacted"]
+    return compacted, stats
+
+
+def compaction_report(stats):
+    """
+    describes the stats of a compaction
+
+    :param stats: the stats of a compaction, as returned by compact_instructions
+    :type stats: dict
+
+    :return: a line that shows how many instructions were removed and why
+    :rtype: str
+    """
+    return (repr(stats["original"]) + " instructions compacted into " + repr(stats["compacted"]) +
+            " (" + repr(stats["removed"]) + " removed: " + repr(stats["dropped"]) + " dropped, " +
+            repr(stats["merged"]) + " merged, " + repr(stats["cancelled"]) + " cancelled)")
+
+
+def top_crates(piles):
+    """
+    gathers all top crates' letters
+
+    :param piles: the piles, the first one is the fake pile
+    :type piles: list
+
+    :return: the string made of all the top crates' letters
+    :rtype: str
+    """
+    return ''.join(pile[-1] for pile in piles[1:] if pile)
+
+
+def part1(segments=False, compact=False):
+    """
+    takes care of part 1
+
+    reads Day5Input.txt and executes the instructions, moving the crates 1 by 1
+
+    :param segments: shows if the piles should be stored as SegmentPile objects instead of lists
+    :type segments: bool
+
+    :param compact: shows if the instructions should be compacted (see compact_instructions) before they're executed
+    :type compact: bool
 
+    :return: the string made of all the top crates' letters after piles are complete
+    :rtype: str
+    """
     with open("Day5Input.txt", 'r') as f:
-        # data will split the file into the diagram part and the instructions part
-        data = f.read().split(' 1   2   3   4   5   6   7   8   9 \n\n')
-        # piles take first part of data, making an ordered list of the piles
-        # based on the input format, the letters appear on each cell from 1 with jumps of 4 (1,5,9..)
-        # for each cell i, we store all lines[i]'s chars to construct a pile.
-        # we then filter out empty chars (' ') and reverse each sublist to receive the correct pile
-        # I added 1 fake pile so we would address the piles with their actual serial number
-        piles = ['X'] + [list(filter(lambda x: x != ' ', reversed([line[i] for line in data[0].splitlines()]))) for i in
-                         range(1, 35, 4)]
-        # instructions are made into a list where each instruction is a trio of the numbers
-        # from the original instruction. first element in each sublist is x, then y and z (see line 9)
-        # the regular expression gives back all sequences of digits in the original string
-        instructions = [[eval(n) for n in re.findall(r'\d+', line)] for line in data[1].splitlines()]
-        new_piles = instructions_exe(piles, instructions)
-        # we now gather all top crates' letters
-        print(reduce(lambda x, y: x + y, [letter[-1] for letter in new_piles[1::]]))
+        piles = read_piles(f)
+        instructions = read_instructions(f)
+        if compact:
+            instructions, stats = compact_instructions(instructions)
+            print(compaction_report(stats))
+        if segments:
+            piles = [SegmentPile(pile) for pile in piles]
+            print(top_crates(segment_instructions_exe(piles, instructions)))
+        else:
+            print(top_crates(instructions_exe(piles, instructions)))
+
+
+def part2(segments=False, compact=False):
+    """
+    takes care of part 2
+
+    reads Day5Input.txt and executes the instructions, moving several crates as a block
+
+    :param segments: shows if the piles should be stored as SegmentPile objects instead of lists
+    :type segments: bool
+
+    :param compact: shows if the instructions should be compacted (see compact_instructions) before they're executed
+    :type compact: bool
+
+    :return: the string made of all the top crates' letters after piles are complete
+    :rtype: str
+    """
+    with open("Day5Input.txt", 'r') as f:
+        piles = read_piles(f)
+        instructions = read_instructions(f)
+        if compact:
+            instructions, stats = compact_instructions(instructions, block=True)
+            print(compaction_report(stats))
+        if segments:
+            piles = [SegmentPile(pile) for pile in piles]
+            print(top_crates(segment_instructions_exe(piles, instructions, block=True)))
+        else:
+            print(top_crates(instructions_exe(piles, instructions, block=True)))
+
+
+def benchmark(piles_count=9, crates=1000000, moves=1000, block=True):
+    """
+    compares the runtime of the lists backend and the segments backend
+
+    builds a random yard and random instructions that move big blocks of crates,
+    executes them with both backends and prints how long each took
+
+    :param piles_count: the number of piles
+    :type piles_count: int
+
+    :param crates: the number of crates in each pile at the beginning
+    :type crates: int
+
+    :param moves: the number of instructions
+    :type moves: int
+
+    :param block: shows if several crates are moved as a block (part 2) instead of 1 by 1 (part 1)
+    :type block: bool
+
+    :return: the runtime in seconds of the lists backend and the segments backend
+    :rtype: tuple
+    """
+    letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    piles = [[]] + [random.choices(letters, k=crates) for i in range(piles_count)]
+    sizes = [len(pile) for pile in piles]
+    instructions = []
+    for i in range(moves):
+        source, target = random.sample(range(1, piles_count + 1), 2)
+        count = random.randint(0, sizes[source])
+        sizes[source] -= count
+        sizes[target] += count
+        instructions.append((count, source, target))
+    segment_piles = [SegmentPile(pile) for pile in piles]
+    start = time.perf_counter()
+    lists_result = top_crates(instructions_exe(piles, instructions, block))
+    lists_time = time.perf_counter() - start
+    start = time.perf_counter()
+    segments_result = top_crates(segment_instructions_exe(segment_piles, instructions, block))
+    segments_time = time.perf_counter() - start
+    assert lists_result == segments_result
+    print("lists: " + repr(lists_time) + " seconds")
+    print("segments: " + repr(segments_time) + " seconds")
+    return lists_time, segments_time
 
 
 def main():
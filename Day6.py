@@ -24,6 +24,245 @@ input: nppdvjthqldpwncqszvftbrmjlhg - output: 23
 input: nznrnfrfntjfmvfwmzdfjlvtqnbhcprsg - output: 29
 input: zcfzfwzzqfrljwzlrfnpqdbhtmscgvjw - output: 26
 """
+from array import array
+
+
+class MarkerDetector:
+    """
+    presents a marker detector for a datastream that arrives in chunks
+
+    the detector keeps the absolute index where each character was last seen and the start of the longest
+    sequence of different characters that ends at the last character fed so far.
+    that's all the state it needs, so chunks can be of any size and memory doesn't grow with the stream
+    """
+
+    def __init__(self, size):
+        """
+        init a detector before any data has arrived
+
+        :param size: the number of different characters we need
+        :type size: int
+        """
+        self.size = size
+        self.last_seen = [-1] * 256
+        self.start = 0
+        # the number of characters fed so far
+        self.position = 0
+        # the serial number of the marker's last character once it's found
+        self.marker = None
+
+    def feed(self, chunk):
+        """
+        goes over the next chunk of the datastream
+
+        when the current character was already seen inside the current sequence, the sequence now starts
+        right after its previous occurrence, so we skip ahead without checking any window again.
+        once the marker is found, the rest of the chunk and any later chunk are ignored
+
+        :param chunk: the next characters of the datastream
+        :type chunk: bytes
+
+        :return: the serial number of the marker's last character if it was found in this chunk, otherwise None
+        :rtype: int
+        """
+        if self.marker is not None:
+            return None
+        last_seen = self.last_seen
+        start = self.start
+        size = self.size
+        for i, char in enumerate(chunk, self.position):
+            if last_seen[char] >= start:
+                start = last_seen[char] + 1
+            last_seen[char] = i
+            if i - start + 1 == size:
+                # we count from 1
+                self.marker = i + 1
+                break
+        self.start = start
+        self.position += len(chunk)
+        return self.marker
+
+
+class MultiMarkerDetector:
+    """
+    presents a marker detector for several sizes of markers at once
+
+    all sizes share the same state: the length of the longest sequence of different characters
+    that ends at a character is enough to know the marker of every size that ends there,
+    since there's a marker of size k there exactly when that length is at least k.
+    it keeps the same state as MarkerDetector, but feed reports the markers of all sizes
+    """
+
+    def __init__(self, sizes, every=False):
+        """
+        init a detector before any data has arrived
+
+        :param sizes: the sizes of the markers we need
+        :type sizes: iterable
+
+        :param every: shows if we need every marker of each size and not only the first one
+        :type every: bool
+        """
+        self.sizes = sorted(set(sizes))
+        self.every = every
+        self.last_seen = [-1] * 256
+        self.start = 0
+        # the number of characters fed so far
+        self.position = 0
+        # maps each size to the serial number of its first marker's last character once it's found
+        self.markers = {}
+        # maps each size to the serial numbers of all of its markers' last characters (only if every is set)
+        self.all_markers = {size: array("I") for size in self.sizes} if every else None
+
+    def feed(self, chunk):
+        """
+        goes over the next chunk of the datastream
+
+        the first markers are found in order of their sizes, so we only compare the current length
+        with the smallest size that wasn't found yet. when every marker is needed, the length is compared
+        with the sizes from the smallest up, and we stop at the first size that is too big
+
+        :param chunk: the next characters of the datastream
+        :type chunk: bytes
+
+        :return: maps each size whose first marker was found in this chunk to that marker
+        :rtype: dict
+        """
+        found = {}
+        if len(self.markers) == len(self.sizes) and not self.every:
+            self.position += len(chunk)
+            return found
+        last_seen = self.last_seen
+        start = self.start
+        sizes = self.sizes
+        # the index of the smallest size that wasn't found yet
+        pending = len(self.markers)
+        for i, char in enumerate(chunk, self.position):
+            if last_seen[char] >= start:
+                start = last_seen[char] + 1
+            last_seen[char] = i
+            length = i - start + 1
+            while pending < len(sizes) and sizes[pending] <= length:
+                found[sizes[pending]] = i + 1
+                pending += 1
+            if self.every:
+                for size in sizes:
+                    if size > length:
+                        break
+                    self.all_markers[size].append(i + 1)
+            elif pending == len(sizes):
+                break
+        self.start = start
+        self.position += len(chunk)
+        self.markers.update(found)
+        return found
+
+
+def find_markers(data, sizes, every=False):
+    """
+    finds the markers of several sizes in a single pass
+
+    :param data: the datastream
+    :type data: bytes
+
+    :param sizes: the sizes of the markers we need
+    :type sizes: iterable
+
+    :param every: shows if we need every marker of each size and not only the first one
+    :type every: bool
+
+    :return: maps each size to its first marker (or None if there's no such marker),
+    or to an array of all of its markers if every is set
+    :rtype: dict
+    """
+    detector = MultiMarkerDetector(sizes, every)
+    detector.feed(data)
+    if every:
+        return detector.all_markers
+    return {size: detector.markers.get(size) for size in detector.sizes}
+
+
+def find_marker(data, size):
+    """
+    finds the first sequence of a given size of characters that are all different
+
+    :param data: the datastream
+    :type data: bytes
+
+    :param size: the number of different characters we need
+    :type size: int
+
+    :return: the serial number of the last character from the sequence, or None if there's no such sequence
+    :rtype: int
+    """
+    return MarkerDetector(size).feed(data)
+
+
+def read_chunks(f, chunk_size=1 << 16):
+    """
+    reads an open binary file (or pipe) chunk by chunk
+
+    :param f: the open file
+    :type f: file
+
+    :param chunk_size: the maximal size of each chunk in bytes
+    :type chunk_size: int
+
+    :return: a generator of the file's chunks
+    :rtype: generator
+    """
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def stream_marker(chunks, size):
+    """
+    finds the first marker of a given size in a datastream of chunks
+
+    chunks are only consumed until the marker is found, so it returns as soon as the marker arrives
+
+    :param chunks: an iterable of chunks of bytes (e.g. the generator of read_chunks)
+    :type chunks: iterable
+
+    :param size: the number of different characters we need
+    :type size: int
+
+    :return: the serial number of the last character from the sequence, or None if the stream ended without one
+    :rtype: int
+    """
+    detector = MarkerDetector(size)
+    for chunk in chunks:
+        if detector.feed(chunk) is not None:
+            break
+    return detector.marker
+
+
+async def async_stream_marker(reader, size, chunk_size=1 << 16):
+    """
+    finds the first marker of a given size in an asynchronous datastream
+
+    :param reader: the stream to read, e.g. an asyncio.StreamReader
+    :type reader: asyncio.StreamReader
+
+    :param size: the number of different characters we need
+    :type size: int
+
+    :param chunk_size: the maximal size of each chunk in bytes
+    :type chunk_size: int
+
+    :return: the serial number of the last character from the sequence, or None if the stream ended without one
+    :rtype: int
+    """
+    detector = MarkerDetector(size)
+    while detector.marker is None:
+        chunk = await reader.read(chunk_size)
+        if not chunk:
+            break
+        detector.feed(chunk)
+    return detector.marker
 
 
 def part1():
@@ -35,31 +274,37 @@ def part1():
     :return: the serial number of the last character from the sequence
     :rtype: int
     """
-    with open("Day6Input.txt", 'r') as f:
-        f_str = f.read()
-    # we check each quartet by using a generator since we don't need all occurrences
-    # we print the index of the last char of the first quartet + 1 since we count from 0
-    sequences = (i + 1 for i in range(3, len(f_str)) if
-                 len(set(f_str[i - 3:i + 1:])) == 4)
-    print(next(sequences))
+    with open("Day6Input.txt", 'rb') as f:
+        print(stream_marker(read_chunks(f), 4))
 
 
 def part2():
     """
     takes care of part 2
 
-    reads Day6Input.txt and finds the first sequence of four characters that are all different.
+    reads Day6Input.txt and finds the first sequence of 14 characters that are all different.
 
     :return: the serial number of the last character from the sequence
     :rtype: int
     """
-    with open("Day6Input.txt", 'r') as f:
-        f_str = f.read()
-    # we check each 14 chars substring by a using generator since we don't need all occurrences
-    # we print the index of the last char of the first fitting substring + 1 since we count from 0
-    sequences = (i + 1 for i in range(13, len(f_str)) if
-                 len(set(f_str[i - 13:i + 1:])) == 14)
-    print(next(sequences))
+    with open("Day6Input.txt", 'rb') as f:
+        print(stream_marker(read_chunks(f), 14))
+
+
+def both_parts():
+    """
+    takes care of both parts in a single pass
+
+    reads Day6Input.txt once and prints the answers of part 1 and part 2
+
+    :return: the answers of part 1 and part 2
+    :rtype: tuple
+    """
+    with open("Day6Input.txt", 'rb') as f:
+        markers = find_markers(f.read(), (4, 14))
+    print(markers[4])
+    print(markers[14])
+    return markers[4], markers[14]
 
 
 def main():
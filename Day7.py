@@ -105,6 +105,13 @@ Directories 'e' and 'a' are both too small; deleting them would not free up enou
 However, directories 'd' and '/' are both big enough!
 Between these, we choose the smallest: d, increasing unused space by 24933642.
 """
+import hashlib
+import mmap
+import os
+import random
+import struct
+import sys
+from array import array
 
 
 class TreeNode:
@@ -112,6 +119,9 @@ class TreeNode:
     presents a tree's node - aka directory
     """
 
+    # __slots__ saves the per-instance __dict__, which matters when a tree has millions of nodes
+    __slots__ = ("data", "children", "size", "father")
+
     def __init__(self, data):
         """
         init directory/node 'ROOT'
@@ -122,47 +132,85 @@ class TreeNode:
 
         :param data: the dir's name
         """
-        self.data = data
+        # names repeat a lot in big trees, so we keep 1 copy of each name
+        self.data = sys.intern(data)
         self.children = {}
         self.size = 0
         self.father = None
 
-    def add_child(self, child):
+    def add_child(self, child, deferred=False):
         """
         adds a child to a given node
 
         makes the child's father be this current node and updates current node's size according
         to the new child's size and so on for all fathers until we finally update the root too.
+        when deferred is set, sizes aren't updated at all, so adding a child doesn't depend on how deep
+        the node is. in that case, update_sizes must be called once the whole tree is built
 
         :param child: the data of child to add
         :type: either TreeNode (directory) or TreeLeaf (file)
+
+        :param deferred: shows if updating the sizes is deferred to update_sizes
+        :type deferred: bool
         """
         child.father = self
         self.children[child.data] = child
+        if deferred:
+            return
         self.size += child.size
         fathers = self.father
         while fathers is not None:
             fathers.size += child.size
             fathers = fathers.father
 
-    def scan_dirs(self, first=True):
+    def update_sizes(self):
+        """
+        calculates the sizes of all directories in a given tree
+
+        we list up the directories so that each directory comes before its children,
+        then go over that list backwards, so every directory's children already have their final size
+        when we add them up. each directory is visited once, without recursion
+
+        :return: the size of this directory
+        :rtype: int
+        """
+        dirs = [self]
+        for node in dirs:
+            dirs += [child for child in node.children.values() if type(child) == TreeNode]
+        for node in reversed(dirs):
+            node.size = sum(child.size for child in node.children.values())
+        return self.size
+
+    def scan_dirs(self, post_order=False):
         """
         scans a given tree for its directories only
 
-        lists up all directories in a given tree and their sizes
+        a generator that goes over all directories in a given tree using an explicit stack instead of recursion,
+        so deep trees are fine and nothing is collected into a list.
+        by default, each directory comes before its subdirectories (pre-order).
+        if post_order is set, each directory comes after all of its subdirectories
+
+        :param post_order: shows if directories should come after their subdirectories
+        :type post_order: bool
 
-        :param first: shows if it's the first time scan_dirs is called since it's recursive
-        :return: a list of tuples, each tuple includes the dir's name and size
-        :rtype: list
+        :return: a generator of tuples, each tuple includes the dir's full path and size
+        :rtype: generator
         """
-        ret = []
-        if first:
-            ret += [(self.data, self.size)]
-        ret += [(child, self.children[child].size) for child in self.children if type(self.children[child]) == TreeNode]
-        for child in self.children:
-            if type(self.children[child]) == TreeNode:
-                ret += self.children[child].scan_dirs(False)
-        return ret
+        # each item is a dir, its path and whether its subdirectories were already scanned (post-order only)
+        stack = [(self, self.data, False)]
+        while stack:
+            node, path, scanned = stack.pop()
+            if scanned or not post_order:
+                yield path, node.size
+                if scanned:
+                    continue
+            else:
+                stack.append((node, path, True))
+            prefix = path if path.endswith("/") else path + "/"
+            # children are pushed in reverse, so they come out of the stack in their original order
+            for child in reversed(node.children.values()):
+                if isinstance(child, TreeNode):
+                    stack.append((child, prefix + child.data, False))
 
     def __repr__(self, level=0):
         """
@@ -183,21 +231,22 @@ class TreeLeaf:
     presents a tree's leaf - aka file
     """
 
+    __slots__ = ("data", "size", "father")
+
     def __init__(self, data, size):
         """
         init file/leaf as a 'separate leaf'
 
-        the files and dirs that are INSIDE the current will be stored in a dict called 'children'
-        size is currently 0 since there nothing inside
         father is currently none since it's a 'separate leaf'.
         the father will be assigned by a node that'll use add_child to add the leaf
 
         :param data: the file's name
         :param size: the file's size
         """
-        self.data = data
+        # names repeat a lot in big trees, so we keep 1 copy of each name
+        self.data = sys.intern(data)
         self.size = size
-        self.father = '~'
+        self.father = None
 
     def __repr__(self, level=0):
         """
@@ -210,95 +259,803 @@ class TreeLeaf:
         return "\t" * level + repr(self.data) + " = " + repr(self.size) + "\n"
 
 
-def part1():
+class SizeTreeNode:
     """
-    takes care of part 1
+    presents a node of the treap that DirSizeIndex keeps the directories' sizes in
 
-    reads Day7Input.txt and finds out all directories with a total size of 100000 or less
+    the nodes are ordered by size like a binary search tree, and each node's priority is bigger than
+    its children's priorities like a heap. priorities are random, so the tree's depth is logarithmic
+    """
 
-    :return: the total size of all directories that has a total size of 100000 or less
-    :rtype: int
+    __slots__ = ("size", "count", "priority", "left", "right", "subtree_sum")
+
+    def __init__(self, size, priority):
+        """
+        init a node of a single directory
+
+        :param size: the directory's size
+        :type size: int
+
+        :param priority: the node's priority
+        :type priority: float
+        """
+        self.size = size
+        # the number of directories of this size
+        self.count = 1
+        self.priority = priority
+        self.left = None
+        self.right = None
+        # the sum of the sizes of all directories in this node's subtree
+        self.subtree_sum = size
+
+    def update_sum(self):
+        """
+        recalculates the node's subtree sum out of its children's sums
+        """
+        self.subtree_sum = self.size * self.count
+        if self.left is not None:
+            self.subtree_sum += self.left.subtree_sum
+        if self.right is not None:
+            self.subtree_sum += self.right.subtree_sum
+
+
+def split_sizes(node, size):
+    """
+    splits a treap into the sizes smaller than a given size and all other sizes
+
+    :param node: the treap's root
+    :type node: SizeTreeNode
+
+    :param size: the size to split by
+    :type size: int
+
+    :return: the roots of the smaller sizes' treap and of the other sizes' treap
+    :rtype: tuple
+    """
+    if node is None:
+        return None, None
+    if node.size < size:
+        node.right, right = split_sizes(node.right, size)
+        node.update_sum()
+        return node, right
+    left, node.left = split_sizes(node.left, size)
+    node.update_sum()
+    return left, node
+
+
+def merge_sizes(left, right):
+    """
+    merges 2 treaps, where all sizes in left are smaller than all sizes in right
+
+    :param left: the root of the treap of the smaller sizes
+    :type left: SizeTreeNode
+
+    :param right: the root of the treap of the bigger sizes
+    :type right: SizeTreeNode
+
+    :return: the root of the merged treap
+    :rtype: SizeTreeNode
+    """
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = merge_sizes(left.right, right)
+        left.update_sum()
+        return left
+    right.left = merge_sizes(left, right.left)
+    right.update_sum()
+    return right
+
+
+class DirSizeIndex:
+    """
+    presents the sizes of all directories in a tree, sorted, so size queries don't scan the tree again
+    """
+
+    def __init__(self, sizes, used):
+        """
+        init the index out of the sizes of all directories
+
+        the sizes are kept in a treap (see SizeTreeNode) where each node knows the sum of its subtree,
+        so both queries and changes of a single size only go down 1 path of the treap.
+        the treap is built balanced right away: each distinct size is placed in the middle of its range
+        of sorted sizes, and nodes get their priorities by levels, the highest ones at the top
+
+        :param sizes: the sizes of all directories, in any order
+        :type sizes: iterable
+
+        :param used: the size of the root, which is the total amount of used space
+        :type used: int
+        """
+        sizes = sorted(sizes)
+        distinct = []
+        for size in sizes:
+            if distinct and distinct[-1].size == size:
+                distinct[-1].count += 1
+                distinct[-1].subtree_sum += size
+            else:
+                distinct.append(SizeTreeNode(size, 0))
+        priorities = sorted((random.random() for i in range(len(distinct))), reverse=True)
+        self.root = None
+        # each item is a range of distinct sizes, the node that'll point at its middle, and on which side
+        levels = [(0, len(distinct), None, None)]
+        position = 0
+        while position < len(levels):
+            start, end, father, side = levels[position]
+            middle = (start + end) // 2
+            node = distinct[middle]
+            node.priority = priorities[position]
+            if father is None:
+                self.root = node
+            else:
+                setattr(father, side, node)
+            if start < middle:
+                levels.append((start, middle, node, "left"))
+            if middle + 1 < end:
+                levels.append((middle + 1, end, node, "right"))
+            position += 1
+        # subtree sums are calculated from the bottom up
+        for start, end, father, side in reversed(levels):
+            distinct[(start + end) // 2].update_sum()
+        self.used = used
+
+    @classmethod
+    def from_tree(cls, root):
+        """
+        builds an index out of a tree whose sizes are already calculated
+
+        :param root: the tree's root
+        :type root: TreeNode
+
+        :return: the index of the tree's directories
+        :rtype: DirSizeIndex
+        """
+        # only the sizes are needed, so the dirs are walked directly instead of through scan_dirs,
+        # which builds every dir's full path (quadratic on deep trees)
+        sizes = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            sizes.append(node.size)
+            for child in node.children.values():
+                if isinstance(child, TreeNode):
+                    stack.append(child)
+        return cls(sizes, root.size)
+
+    def sum_at_most(self, threshold):
+        """
+        sums up the sizes of all directories with a total size of threshold or less
+
+        :param threshold: the maximal size of a directory to count
+        :type threshold: int
+
+        :return: the total size of all directories that has a total size of threshold or less
+        :rtype: int
+        """
+        total = 0
+        node = self.root
+        while node is not None:
+            if node.size <= threshold:
+                # the node and its whole left subtree are small enough
+                total += node.subtree_sum - (node.right.subtree_sum if node.right is not None else 0)
+                node = node.right
+            else:
+                node = node.left
+        return total
+
+    def smallest_at_least(self, need):
+        """
+        finds the smallest directory with a total size of need or more
+
+        :param need: the minimal size of the directory
+        :type need: int
+
+        :return: the size of the smallest such directory, or None if there's no such directory
+        :rtype: int
+        """
+        best = None
+        node = self.root
+        while node is not None:
+            if node.size >= need:
+                best = node.size
+                node = node.left
+            else:
+                node = node.right
+        return best
+
+    def to_free(self, disk_size=70000000, required_free=30000000):
+        """
+        finds the smallest directory that would free enough space if deleted
+
+        :param disk_size: the total size of the file system
+        :type disk_size: int
+
+        :param required_free: the amount of unused space we need
+        :type required_free: int
+
+        :return: the size of the directory that'll free the minimum amount of space needed
+        :rtype: int
+        """
+        return self.smallest_at_least(required_free - (disk_size - self.used))
+
+    def insert(self, size):
+        """
+        adds a new directory's size to the index
+
+        the treap is split around the size, and either the node of that size counts 1 more directory
+        or a new node is put between the 2 parts
+
+        :param size: the new directory's size
+        :type size: int
+        """
+        left, right = split_sizes(self.root, size)
+        middle, right = split_sizes(right, size + 1)
+        if middle is None:
+            middle = SizeTreeNode(size, random.random())
+        else:
+            middle.count += 1
+            middle.update_sum()
+        self.root = merge_sizes(merge_sizes(left, middle), right)
+
+    def remove(self, size):
+        """
+        removes a directory's size from the index
+
+        :param size: the directory's size
+        :type size: int
+        """
+        left, right = split_sizes(self.root, size)
+        middle, right = split_sizes(right, size + 1)
+        if middle is not None:
+            middle.count -= 1
+            middle.update_sum()
+            if middle.count == 0:
+                middle = None
+        self.root = merge_sizes(merge_sizes(left, middle), right)
+
+    def update(self, old_size, new_size):
+        """
+        changes the size of a directory in the index
+
+        :param old_size: the directory's size before the change
+        :type old_size: int
+
+        :param new_size: the directory's size after the change
+        :type new_size: int
+        """
+        self.remove(old_size)
+        self.insert(new_size)
+
+
+def resolve_path(current, target):
+    """
+    finds the full path of a 'cd' target
+
+    absolute targets start from the root and relative ones from the current path.
+    '..' moves out 1 level (but never above the root) and '.' stays in place
+
+    :param current: the full path of the current directory
+    :type current: str
+
+    :param target: the 'cd' target, e.g. 'a', '..', '/a/b' or 'a/../b'
+    :type target: str
+
+    :return: the full path of the target, e.g. '/a/b'
+    :rtype: str
+    """
+    names = [] if target.startswith('/') else [name for name in current.split('/') if name]
+    for name in target.split('/'):
+        if name == '..':
+            if names:
+                names.pop()
+        elif name and name != '.':
+            names.append(name)
+    return '/' + '/'.join(names)
+
+
+class TranscriptIngester:
+    """
+    presents a directories tree that keeps growing as new terminal lines arrive
+
+    the tree, the current directory (pointer) and any index built by add_index are kept between calls,
+    and every new file updates the sizes of its directory and all of its fathers right away,
+    so the answers are always up to date and each line only costs its own directory's depth.
+    'cd' accepts absolute and relative paths. optionally, every directory is also kept in a dict
+    by its full path, so jumping to any path and size queries by path are a single lookup
     """
 
-    with open("Day7Input.txt", 'r') as f:
-        lines = f.read().splitlines()
-    # initiating the directories tree
-    root = TreeNode("/")
-    # assigning pointer to current directory
-    pointer = root
-    # we start scanning all commands after the first which was '$ cd /'
-    for line in lines[1:]:
-        # case: command
-        if line.startswith('$'):
-            # command: change directory
-            if line[2:4] == 'cd':
-                # '$ cd ..':  move out 1 level
-                if line[5:] == '..':
-                    pointer = pointer.father
-                # '$ cd <dir_name>': move in 1 level into dir_name
+    def __init__(self, root=None, deferred=False, paths=False):
+        """
+        init an ingester, either of a new tree or of an existing one
+
+        when deferred is set, sizes aren't updated while lines are ingested (see TreeNode.add_child),
+        which is faster when a whole transcript is read at once. in that case, finish must be called
+        once all lines are in, and indexes can't be added before that
+
+        :param root: a tree to continue from, whose sizes are already calculated
+        :type root: TreeNode
+
+        :param deferred: shows if updating the sizes is deferred to finish
+        :type deferred: bool
+
+        :param paths: shows if directories should be kept in a dict by their full paths
+        :type paths: bool
+        """
+        self.root = root or TreeNode("/")
+        self.pointer = self.root
+        self.deferred = deferred
+        self.indexes = []
+        # the beginning of a line whose end hasn't arrived yet (see ingest_file)
+        self.partial = ''
+        # maps each directory's full path to the directory and each directory back to its full path.
+        # paths are interned since they repeat in every lookup
+        self.paths = None
+        self.dir_paths = None
+        if paths:
+            self.paths = {"/": self.root}
+            self.dir_paths = {self.root: "/"}
+            stack = [self.root]
+            while stack:
+                node = stack.pop()
+                for child in node.children.values():
+                    if isinstance(child, TreeNode):
+                        self.add_path(node, child)
+                        stack.append(child)
+
+    def add_path(self, father, child):
+        """
+        adds a directory to the paths' dicts, right after its father was added
+
+        :param father: the directory's father
+        :type father: TreeNode
+
+        :param child: the directory
+        :type child: TreeNode
+        """
+        father_path = self.dir_paths[father]
+        path = sys.intern(father_path + child.data if father_path == "/" else father_path + "/" + child.data)
+        self.paths[path] = child
+        self.dir_paths[child] = path
+
+    def finish(self):
+        """
+        calculates the sizes of the tree once all lines are in, when sizes are deferred
+
+        :return: the tree's root
+        :rtype: TreeNode
+        """
+        if self.deferred:
+            self.root.update_sizes()
+            self.deferred = False
+        return self.root
+
+    def add_index(self):
+        """
+        builds a DirSizeIndex of the tree that is kept up to date with every new line
+
+        :return: the index
+        :rtype: DirSizeIndex
+        """
+        self.finish()
+        index = DirSizeIndex.from_tree(self.root)
+        self.indexes.append(index)
+        return index
+
+    def ingest(self, lines):
+        """
+        adds new terminal lines to the tree
+
+        a directory or file that was already listed isn't added again, so listing a directory twice
+        doesn't count its files twice. a file that was listed with a new size only changes by the difference
+
+        :param lines: the new lines
+        :type lines: iterable
+        """
+        for line in lines:
+            line = line.rstrip('\n')
+            # case: command
+            if line.startswith('$'):
+                # command: change directory
+                if line[2:4] == 'cd':
+                    self.cd(line[5:])
+            # case: a line from ls printing
+            elif line:
+                # pointer contains a directory
+                if line.startswith("dir "):
+                    self.add_dir(line[4:])
+                # pointer contains a file which means the line's format is '{number} {file_name}'
                 else:
-                    pointer = pointer.children[line[5:]]
-        # case: a line from ls printing
+                    size, name = line.split(' ', 1)
+                    self.add_file(name, int(size))
+
+    def ingest_file(self, f):
+        """
+        adds the lines that were appended to an open transcript file since the last call
+
+        a line without a newline at its end might still be written, so it's kept until its end arrives
+
+        :param f: the open transcript file
+        :type f: file
+        """
+        data = self.partial + f.read()
+        lines = data.split('\n')
+        self.partial = lines.pop()
+        self.ingest(lines)
+
+    def cd(self, target):
+        """
+        changes the current directory
+
+        a single name and '..' are followed directly from the current directory.
+        a path is looked up in the paths' dict if there is one, otherwise it's followed name by name.
+        directories on the way that weren't listed yet are added
+
+        :param target: the 'cd' target, either an absolute or a relative path
+        :type target: str
+
+        :return: the new current directory
+        :rtype: TreeNode
+        """
+        if target == '/':
+            node = self.root
+        elif target == '..':
+            node = self.pointer.father or self.root
+        elif target == '.':
+            node = self.pointer
+        elif '/' not in target:
+            node = self.add_dir(target)
         else:
-            # pointer contains a directory
-            if line.startswith("dir "):
-                # we add a new TreeNode to the pointer's children
-                pointer.add_child(TreeNode(line[4:]))
-            # pointer contains a file which means the line's format is '{number} {file_name}'
-            else:
-                file_data = line.split(' ')
-                pointer.add_child(TreeLeaf(file_data[1], eval(file_data[0])))
-    # print(root)
-    # print(root.scan_dirs())
-    print(sum(d[1] for d in root.scan_dirs() if d[1] <= 100000))
+            node = None
+            if self.paths is not None:
+                node = self.paths.get(resolve_path(self.dir_paths[self.pointer], target))
+            if node is None:
+                node = self.follow(target)
+        self.pointer = node
+        return node
+
+    def follow(self, target, create=True):
+        """
+        follows a path name by name, from the root if it's absolute or from the current directory otherwise
+
+        :param target: the path, e.g. '/a/b', 'a/b' or '../a'
+        :type target: str
+
+        :param create: shows if directories on the way that weren't listed yet should be added
+        :type create: bool
+
+        :return: the directory at the end of the path
+        :rtype: TreeNode
+        """
+        node = self.root if target.startswith('/') else self.pointer
+        for name in target.split('/'):
+            if name == '..':
+                node = node.father or self.root
+            elif name and name != '.':
+                child = node.children.get(name)
+                if child is None:
+                    if not create:
+                        raise KeyError(target)
+                    child = self.add_dir(name, node)
+                node = child
+        return node
+
+    def dir_size(self, path):
+        """
+        finds the total size of a directory by its path
+
+        :param path: the directory's path, either absolute or relative to the current directory
+        :type path: str
+
+        :return: the directory's total size
+        :rtype: int
+        """
+        self.finish()
+        if self.paths is not None:
+            return self.paths[resolve_path(self.dir_paths[self.pointer], path)].size
+        return self.follow(path, create=False).size
+
+    def add_dir(self, name, father=None):
+        """
+        adds a directory to a given directory unless it's already there
+
+        :param name: the directory's name
+        :type name: str
+
+        :param father: the directory to add to, the current directory by default
+        :type father: TreeNode
+
+        :return: the directory
+        :rtype: TreeNode
+        """
+        father = father or self.pointer
+        child = father.children.get(name)
+        if child is None:
+            child = TreeNode(name)
+            father.add_child(child, deferred=True)
+            if self.paths is not None:
+                self.add_path(father, child)
+            for index in self.indexes:
+                index.insert(0)
+        return child
+
+    def add_file(self, name, size):
+        """
+        adds a file to the current directory, or updates its size if it's already there
+
+        :param name: the file's name
+        :type name: str
+
+        :param size: the file's size
+        :type size: int
+        """
+        child = self.pointer.children.get(name)
+        if child is None:
+            self.pointer.add_child(TreeLeaf(name, size), deferred=True)
+            change = size
+        else:
+            change = size - child.size
+            child.size = size
+        if change == 0 or self.deferred:
+            return
+        node = self.pointer
+        while node is not None:
+            for index in self.indexes:
+                index.update(node.size, node.size + change)
+            node.size += change
+            node = node.father
+        for index in self.indexes:
+            index.used = self.root.size
+
+
+def build_tree(lines):
+    """
+    builds the directories tree out of the terminal's lines
+
+    sizes are calculated once the whole tree is built (see update_sizes)
+
+    :param lines: the lines of the terminal output
+    :type lines: iterable
+
+    :return: the tree's root
+    :rtype: TreeNode
+    """
+    ingester = TranscriptIngester(deferred=True)
+    ingester.ingest(lines)
+    return ingester.finish()
 
 
-def part2():
+# a snapshot begins with a header of a magic word, the sha256 of the transcript, the number of nodes,
+# the number of directories and the size of the names' part, so a truncated snapshot is easy to spot.
+# then comes a column of the directories' sizes (int64 in the machine's byte order, the root's first),
+# so size queries can be answered straight from it without building the tree.
+# then comes a table of nodes, each is its father's row (-1 for the root), its size,
+# the offset and length of its name in the names' part at the end, and whether it's a directory
+SNAPSHOT_MAGIC = b"D7T2"
+SNAPSHOT_HEADER = struct.Struct("<4s32sIII")
+SNAPSHOT_NODE = struct.Struct("<iqIIB")
+DIR_SIZE_BYTES = array("q").itemsize
+
+
+def save_snapshot(root, file_name, digest):
+    """
+    saves a tree into a binary snapshot file
+
+    nodes are written in pre-order, so each node's father is always written before it
+
+    :param root: the tree's root
+    :type root: TreeNode
+
+    :param file_name: the name of the snapshot file
+    :type file_name: str
+
+    :param digest: the sha256 of the transcript the tree was built from
+    :type digest: bytes
+    """
+    nodes = bytearray()
+    names = bytearray()
+    dir_sizes = array("q")
+    count = 0
+    stack = [(root, -1)]
+    while stack:
+        node, father = stack.pop()
+        name = node.data.encode()
+        is_dir = isinstance(node, TreeNode)
+        nodes += SNAPSHOT_NODE.pack(father, node.size, len(names), len(name), is_dir)
+        names += name
+        if is_dir:
+            dir_sizes.append(node.size)
+            stack += [(child, count) for child in reversed(node.children.values())]
+        count += 1
+    # we write into a temporary file and only then replace the snapshot with it,
+    # so an interrupted write never leaves a truncated snapshot behind
+    temp_name = file_name + ".tmp"
+    with open(temp_name, 'wb') as f:
+        f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, digest, count, len(dir_sizes), len(names)))
+        f.write(dir_sizes.tobytes())
+        f.write(nodes)
+        f.write(names)
+    os.replace(temp_name, file_name)
+
+
+def load_snapshot(file_name, digest):
+    """
+    loads a tree from a binary snapshot file
+
+    the file is memory mapped and its table is unpacked row by row. sizes are already in the table,
+    so the tree doesn't need update_sizes
+
+    :param file_name: the name of the snapshot file
+    :type file_name: str
+
+    :param digest: the sha256 of the transcript we need the tree of
+    :type digest: bytes
+
+    :return: the tree's root, or None if the snapshot doesn't exist, is broken or belongs to another transcript
+    :rtype: TreeNode
+    """
+    if not os.path.exists(file_name) or os.path.getsize(file_name) < SNAPSHOT_HEADER.size:
+        return None
+    with open(file_name, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        magic, snapshot_digest, count, dir_count, names_size = SNAPSHOT_HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC or snapshot_digest != digest:
+            return None
+        table_start = SNAPSHOT_HEADER.size + dir_count * DIR_SIZE_BYTES
+        names_start = table_start + count * SNAPSHOT_NODE.size
+        if count == 0 or len(data) != names_start + names_size:
+            return None
+        nodes = []
+        try:
+            for father, size, offset, length, is_dir in SNAPSHOT_NODE.iter_unpack(
+                    data[table_start:names_start]):
+                if offset + length > names_size or father >= len(nodes):
+                    return None
+                name = data[names_start + offset:names_start + offset + length].decode()
+                if is_dir:
+                    node = TreeNode(name)
+                    node.size = size
+                else:
+                    node = TreeLeaf(name, size)
+                if father >= 0:
+                    nodes[father].add_child(node, deferred=True)
+                nodes.append(node)
+        except (struct.error, UnicodeDecodeError, AttributeError):
+            # a broken snapshot is simply ignored, and the transcript is parsed again
+            return None
+    return nodes[0]
+
+
+def load_snapshot_index(file_name, digest):
+    """
+    builds a DirSizeIndex straight from the directories' sizes column of a binary snapshot file
+
+    the file is memory mapped and the column is read through a memoryview, so neither the tree
+    nor a copy of the file is made
+
+    :param file_name: the name of the snapshot file
+    :type file_name: str
+
+    :param digest: the sha256 of the transcript we need the index of
+    :type digest: bytes
+
+    :return: the index, or None if the snapshot doesn't exist, is broken or belongs to another transcript
+    :rtype: DirSizeIndex
+    """
+    if not os.path.exists(file_name) or os.path.getsize(file_name) < SNAPSHOT_HEADER.size:
+        return None
+    with open(file_name, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        magic, snapshot_digest, count, dir_count, names_size = SNAPSHOT_HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC or snapshot_digest != digest:
+            return None
+        table_start = SNAPSHOT_HEADER.size + dir_count * DIR_SIZE_BYTES
+        if dir_count == 0 or len(data) != table_start + count * SNAPSHOT_NODE.size + names_size:
+            return None
+        with memoryview(data) as view, view[SNAPSHOT_HEADER.size:table_start].cast("q") as sizes:
+            # the root's size, which is the total amount of used space, comes first
+            return DirSizeIndex(sizes, sizes[0])
+
+
+def load_index(file_name, snapshot=True):
+    """
+    reads a transcript file into a DirSizeIndex of its directories
+
+    the transcript's sha256 is checked against the snapshot next to it ('{file_name}.snapshot').
+    if they match, the index is built straight from the snapshot's sizes column (see load_snapshot_index).
+    otherwise, the transcript is parsed and a new snapshot is saved
+
+    :param file_name: the name of the transcript file
+    :type file_name: str
+
+    :param snapshot: shows if snapshots should be used
+    :type snapshot: bool
+
+    :return: the index of the transcript's directories
+    :rtype: DirSizeIndex
+    """
+    with open(file_name, 'rb') as f:
+        transcript = f.read()
+    if not snapshot:
+        return DirSizeIndex.from_tree(build_tree(transcript.decode().splitlines()))
+    digest = hashlib.sha256(transcript).digest()
+    index = load_snapshot_index(file_name + ".snapshot", digest)
+    if index is None:
+        root = build_tree(transcript.decode().splitlines())
+        save_snapshot(root, file_name + ".snapshot", digest)
+        index = DirSizeIndex.from_tree(root)
+    return index
+
+
+def load_tree(file_name, snapshot=False):
+    """
+    reads a transcript file into a directories tree
+
+    if snapshot is set, the transcript's sha256 is checked against the snapshot next to it
+    ('{file_name}.snapshot'). if they match, the tree is loaded from the snapshot instead of parsing
+    the transcript again. otherwise, the transcript is parsed and a new snapshot is saved.
+    rebuilding every node from a snapshot costs about as much as parsing, so it's off by default.
+    when only directory sizes are needed, load_index is much faster
+
+    :param file_name: the name of the transcript file
+    :type file_name: str
+
+    :param snapshot: shows if snapshots should be used
+    :type snapshot: bool
+
+    :return: the tree's root
+    :rtype: TreeNode
+    """
+    with open(file_name, 'rb') as f:
+        transcript = f.read()
+    if not snapshot:
+        return build_tree(transcript.decode().splitlines())
+    digest = hashlib.sha256(transcript).digest()
+    root = load_snapshot(file_name + ".snapshot", digest)
+    if root is None:
+        root = build_tree(transcript.decode().splitlines())
+        save_snapshot(root, file_name + ".snapshot", digest)
+    return root
+
+
+def part1(index=None):
+    """
+    takes care of part 1
+
+    finds out all directories of Day7Input.txt with a total size of 100000 or less
+
+    :param index: the DirSizeIndex of Day7Input.txt, it's loaded if not given
+    :type index: DirSizeIndex
+
+    :return: the total size of all directories that has a total size of 100000 or less
+    :rtype: int
+    """
+    index = index or load_index("Day7Input.txt")
+    print(index.sum_at_most(100000))
+
+
+def part2(index=None):
     """
     takes care of part 2
 
-    reads Day7Input.txt and finds out the directory with the smallest size that is still enough
+    finds out the directory of Day7Input.txt with the smallest size that is still enough
     to free up enough space in the system if deleted, up to the total of 30000000 unused space
 
+    :param index: the DirSizeIndex of Day7Input.txt, it's loaded if not given
+    :type index: DirSizeIndex
+
     :return: the size of the directory that'll free the minimum amount of space
     needed to give us a total of 30000000 unused space in the whole system.
     :rtype: int
     """
-    with open("Day7Input.txt", 'r') as f:
-        lines = f.read().splitlines()
-    # initiating the directories tree
-    root = TreeNode("/")
-    # assigning pointer to current directory
-    pointer = root
-    # we start scanning all commands after the first which was '$ cd /'
-    for line in lines[1:]:
-        # case: command
-        if line.startswith('$'):
-            # command: change directory
-            if line[2:4] == 'cd':
-                # '$ cd ..':  move out 1 level
-                if line[5:] == '..':
-                    pointer = pointer.father
-                # '$ cd <dir_name>': move in 1 level into dir_name
-                else:
-                    pointer = pointer.children[line[5:]]
-        # case: a line from ls printing
-        else:
-            # pointer contains a directory
-            if line.startswith("dir "):
-                # we add a new TreeNode to the pointer's children
-                pointer.add_child(TreeNode(line[4:]))
-            # pointer contains a file which means the line's format is '{number} {file_name}'
-            else:
-                file_data = line.split(' ')
-                pointer.add_child(TreeLeaf(file_data[1], eval(file_data[0])))
-    free_space = 70000000 - root.size
-    print(min(d[1] for d in root.scan_dirs() if d[1] + free_space >= 30000000))
+    index = index or load_index("Day7Input.txt")
+    print(index.to_free(70000000, 30000000))
 
 
 def main():
-    part1()
-    part2()
+    # both parts use the same index
+    index = load_index("Day7Input.txt")
+    part1(index)
+    part2(index)
 
 
 if __name__ == "__main__":